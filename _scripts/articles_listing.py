@@ -0,0 +1,98 @@
+"""
+═══════════════════════════════════════════════════════════
+  Listing paginé du blog — Laura Ballo Coaching
+═══════════════════════════════════════════════════════════
+  Utilisé par publish.py (save_articles_json) ; lu par
+  assets/js/blog.js et le script des collections de blog/index.html.
+
+  articles.json reste la source complète (publish.py, sitemap) ; la
+  page /blog/ lit à la place :
+
+    blog/listing.json                  manifeste léger : collections,
+                                       1re page de cartes, noms des shards
+    blog/listing/page-2.<hash>.json    pages suivantes (PAGE_SIZE cartes)
+    blog/listing/tag-<slug>.<hash>.json        une par collection
+    blog/listing/situation-<slug>.<hash>.json  une par situation
+
+  Une carte ne garde que ce qu'affiche blog.js (pas de searchKeywords).
+  Les situations viennent telles quelles de Notion : le manifeste garde
+  la valeur brute comme clé (blog.js la cherche ainsi), le nom de
+  fichier passe par le slugify de publish.py, comme les tags.
+  Le hash (contenu) rend les shards immuables : servis avec un cache
+  long (vercel.json), seul le manifeste est revalidé. Les shards qui
+  ne sont plus référencés sont supprimés.
+═══════════════════════════════════════════════════════════
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# ─────────────────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────────────────
+PAGE_SIZE = int(os.environ.get("ARTICLES_PAGE_SIZE") or 12)
+HASH_LENGTH = 8
+CARD_FIELDS = (
+    "slug", "title", "url", "date", "readingTime", "excerpt", "tags", "situations",
+    "category", "image", "imageSrcset", "imageWidth", "imageHeight", "featured",
+)
+
+
+def card(article):
+    return {k: article[k] for k in CARD_FIELDS if k in article}
+
+
+def compact(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_shard(directory, name, cards):
+    """Écrit `<name>.<hash>.json` s'il n'existe pas ; retourne le nom de fichier."""
+    contenu = compact(cards)
+    digest = hashlib.sha256(contenu.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+    filename = f"{name}.{digest}.json"
+    path = Path(directory) / filename
+    if not path.exists():
+        path.write_text(contenu, encoding="utf-8")
+    return filename
+
+
+def save_listing(manifest_path, directory, articles, collections, slugify):
+    """
+    Manifeste + shards pour `articles` (déjà triés, plus récent d'abord).
+    `slugify` : celui de publish.py, pour les noms de fichier des situations.
+    """
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    cards = [card(article) for article in articles]
+    pages = [cards[i:i + PAGE_SIZE] for i in range(0, len(cards), PAGE_SIZE)] or [[]]
+    situations = sorted({s for c in cards for s in c.get("situations") or []})
+
+    manifest = {
+        "collections": collections,
+        "total": len(cards),
+        "pageSize": PAGE_SIZE,
+        "pages": [
+            write_shard(directory, f"page-{n}", page)
+            for n, page in enumerate(pages[1:], start=2)
+        ],
+        "tags": {
+            c["slug"]: write_shard(
+                directory, f"tag-{c['slug']}", [x for x in cards if c["slug"] in x.get("tags", [])]
+            )
+            for c in collections
+        },
+        "situations": {
+            s: write_shard(
+                directory, f"situation-{slugify(s)}", [x for x in cards if s in x.get("situations", [])]
+            )
+            for s in situations
+        },
+        "articles": pages[0],
+    }
+    references = {*manifest["pages"], *manifest["tags"].values(), *manifest["situations"].values()}
+    for path in Path(directory).glob("*.json"):
+        if path.name not in references:
+            path.unlink()
+    Path(manifest_path).write_text(compact(manifest), encoding="utf-8")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+═══════════════════════════════════════════════════════════
+  Micro-benchmark des gabarits — Laura Ballo Coaching
+═══════════════════════════════════════════════════════════
+  Compare, sur les vrais gabarits de _templates/, l'ancien rendu
+  (un str.replace par slot) au moteur compilé de template_engine.py,
+  avec des valeurs factices de taille réaliste. Vérifie au passage
+  que les deux rendus sont identiques.
+
+  Usage (depuis la racine du dépôt) :
+    python _scripts/bench_templates.py
+    python _scripts/bench_templates.py 5000     # nombre de rendus
+═══════════════════════════════════════════════════════════
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+from template_engine import SLOT_RE, compile_template
+
+GABARITS = [
+    "_templates/article.html",
+    "_templates/formation.html",
+    "_templates/formations-index.html",
+]
+CONTENU_OCTETS = 30_000   # ordre de grandeur d'un article ou d'un programme
+
+
+def valeurs_factices(template):
+    """Une valeur par slot ; le plus gros slot reçoit ~CONTENU_OCTETS de HTML."""
+    slots = sorted(set(SLOT_RE.findall(template)))
+    values = {name: f"valeur de {name.lower()}" for name in slots}
+    for gros in ("CONTENT", "PROGRAMME_HTML", "CARDS_HTML"):
+        if gros in values:
+            paragraphe = "    <p>Lorem ipsum dolor sit amet, <strong>consectetur</strong>.</p>\n"
+            values[gros] = paragraphe * (CONTENU_OCTETS // len(paragraphe))
+    return values
+
+
+def rendu_par_replace(template, values):
+    """Ancienne approche : une copie complète du document par slot."""
+    out = template
+    for key, value in values.items():
+        out = out.replace("{{" + key + "}}", str(value))
+    return out
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{'gabarit':32s} {'slots':>5s} {'replace':>11s} {'compilé':>11s} {'gain':>6s}")
+    for chemin in GABARITS:
+        if not Path(chemin).exists():
+            print(f"{chemin:32s} introuvable")
+            continue
+        template = Path(chemin).read_text(encoding="utf-8")
+        values = valeurs_factices(template)
+        compile_template(template, values, chemin)   # compilation hors mesure
+
+        assert rendu_par_replace(template, values) == (
+            compile_template(template, values, chemin).render(values)
+        ), f"rendus différents pour {chemin}"
+
+        t_replace = timeit.timeit(lambda: rendu_par_replace(template, values), number=n)
+        t_compile = timeit.timeit(
+            lambda: compile_template(template, values, chemin).render(values), number=n
+        )
+        print(
+            f"{chemin:32s} {len(values):5d} "
+            f"{t_replace / n * 1e6:9.1f}µs {t_compile / n * 1e6:9.1f}µs "
+            f"{t_replace / t_compile:5.1f}×"
+        )
+
+
+if __name__ == "__main__":
+    main()
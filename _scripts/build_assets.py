@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+═══════════════════════════════════════════════════════════
+  Assets versionnés — Laura Ballo Coaching
+═══════════════════════════════════════════════════════════
+  Minifie assets/css/*.css et assets/js/*.js et les écrit sous un nom
+  qui contient le hash de leur contenu :
+    assets/css/main.css  →  assets/dist/main.3f2a1b9c.min.css
+  Les URLs ne changeant qu'avec le contenu, vercel.json peut les servir
+  en « Cache-Control: immutable » : une visite suivante ne refait
+  aucune requête pour le CSS et le JS.
+
+    1. Minification sans dépendance : commentaires et blancs retirés,
+       chaînes, gabarits `…` et regex JS recopiés tels quels ; les
+       retours à la ligne du JS sont gardés (insertion auto des « ; »)
+    2. @import / url() relatifs des CSS réécrits en absolu, vers la
+       version versionnée quand elle existe (tokens.css…)
+    3. Manifeste assets/assets-manifest.json : URL source → URL versionnée
+    4. Références réécrites dans les pages statiques ; publish.py et
+       publish_formations.py appliquent rewrite_asset_urls() à leur
+       rendu. Les sources restent servies sous leur nom d'origine pour
+       toute page non traitée.
+    5. En-tête immutable pour /assets/dist/ ajouté à vercel.json s'il
+       manque ; anciennes versions supprimées de assets/dist/
+
+  Les sources restent les fichiers à éditer : relancer ce script après
+  toute modification de CSS ou de JS.
+
+  Usage (depuis la racine du dépôt) :
+    python _scripts/build_assets.py
+═══════════════════════════════════════════════════════════
+"""
+
+import functools
+import hashlib
+import json
+import posixpath
+import re
+import subprocess
+import time
+from pathlib import Path
+
+from inline_components import walk_pages
+
+# ─────────────────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────────────────
+SOURCES = [("assets/css", ".css"), ("assets/js", ".js")]
+DIST_DIR = "assets/dist"
+MANIFEST_PATH = "assets/assets-manifest.json"   # hors de DIST_DIR : pas servi en immutable
+VERCEL_PATH = "vercel.json"
+HASH_LENGTH = 8
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_STRING = r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+
+
+# ═════════════════════════════════════════════════════════
+# MINIFICATION CSS
+# ═════════════════════════════════════════════════════════
+CSS_TOKENS = re.compile(rf"({_STRING})|/\*.*?\*/|\s+", re.S)
+CSS_PUNCT = re.compile(rf"({_STRING})|\s*([{{}};,])\s*|(:)\s+")
+CSS_URL = re.compile(
+    r"""(@import\s+(?!url\()|url\()\s*(["']?)([^"')\s]+)\2""", re.I
+)
+
+
+def minify_css(source):
+    # 1. commentaires supprimés, blancs réduits à une espace (hors chaînes)
+    out = CSS_TOKENS.sub(lambda m: m.group(1) or ("" if m.group(0)[:2] == "/*" else " "), source)
+    # 2. plus d'espace autour de { } ; , ni après « : » — l'espace avant
+    #    « : » et autour de + ~ > reste (a :hover ≠ a:hover, calc(a + b))
+    out = CSS_PUNCT.sub(lambda m: m.group(1) or m.group(2) or m.group(3), out)
+    return out.replace(";}", "}").strip() + "\n"
+
+
+def rewrite_css_urls(css, source_url, urls):
+    """url()/@import relatifs → absolus, puis versionnés s'ils sont connus."""
+
+    def repl(m):
+        prefix, quote, target = m.groups()
+        if target.startswith(("/", "data:", "http:", "https:", "#")):
+            absolute = target
+        else:
+            absolute = posixpath.normpath(
+                posixpath.join(posixpath.dirname(source_url), target)
+            )
+        return f"{prefix}{quote}{urls.get(absolute, absolute)}{quote}"
+
+    return CSS_URL.sub(repl, css)
+
+
+# ═════════════════════════════════════════════════════════
+# MINIFICATION JS
+# ═════════════════════════════════════════════════════════
+# Après ces caractères / mots, un « / » ouvre une regex et non une division
+REGEX_AFTER_CHARS = set("(,=:[!&|?{};+-*%<>~^")
+REGEX_AFTER_WORDS = {
+    "return", "typeof", "case", "do", "else", "in", "of", "new",
+    "delete", "void", "throw", "instanceof", "yield", "await",
+}
+
+
+def _is_word(c):
+    return c.isalnum() or c in "_$"
+
+
+def _skip_string(src, i):
+    quote, i = src[i], i + 1
+    while i < len(src) and src[i] != quote:
+        i += 2 if src[i] == "\\" else 1
+    return i + 1
+
+
+def _skip_template(src, i):
+    """Fin d'un gabarit `…${…}…`, expressions (et gabarits imbriqués) comprises."""
+    i += 1
+    while i < len(src):
+        c = src[i]
+        if c == "\\":
+            i += 2
+        elif c == "`":
+            return i + 1
+        elif src.startswith("${", i):
+            i, depth = i + 2, 1
+            while i < len(src) and depth:
+                c = src[i]
+                if c in "'\"":
+                    i = _skip_string(src, i)
+                elif c == "`":
+                    i = _skip_template(src, i)
+                else:
+                    depth += (c == "{") - (c == "}")
+                    i += 1
+        else:
+            i += 1
+    return i
+
+
+def _skip_regex(src, i):
+    i, in_class = i + 1, False
+    while i < len(src):
+        c = src[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "\n":
+            break
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            i += 1
+            while i < len(src) and _is_word(src[i]):
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+def _regex_allowed(out):
+    """Un « / » après ce qui a déjà été émis commence-t-il une regex ?"""
+    tail = "".join(out[-12:]).rstrip()
+    if not tail:
+        return True
+    if not _is_word(tail[-1]):
+        return tail[-1] in REGEX_AFTER_CHARS
+    word = re.search(r"[\w$]+$", tail).group(0)
+    return word in REGEX_AFTER_WORDS
+
+
+def minify_js(src):
+    out = []
+    pending = ""          # blanc en attente : "", " " ou "\n"
+    i, n = 0, len(src)
+    while i < n:
+        c = src[i]
+        if c in " \t\r\n\f\v":
+            if c == "\n":
+                pending = "\n"
+            elif not pending:
+                pending = " "
+            i += 1
+            continue
+        if src.startswith("//", i):
+            i = src.find("\n", i)
+            i = n if i < 0 else i
+            continue
+        if src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            pending = pending or " "
+            continue
+
+        if c in "'\"":
+            j = _skip_string(src, i)
+        elif c == "`":
+            j = _skip_template(src, i)
+        elif c == "/" and _regex_allowed(out):
+            j = _skip_regex(src, i)
+        else:
+            j = i + 1
+
+        if pending and out:
+            prev = out[-1][-1]
+            if pending == "\n":
+                # retour à la ligne gardé : l'insertion auto des « ; » en dépend
+                out.append("\n")
+            elif (_is_word(prev) and _is_word(c)) or (prev in "+-" and c in "+-"):
+                out.append(" ")
+        pending = ""
+        out.append(src[i:j])
+        i = j
+    return "".join(out).strip() + "\n"
+
+
+# ═════════════════════════════════════════════════════════
+# CONSTRUCTION
+# ═════════════════════════════════════════════════════════
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+@functools.lru_cache(maxsize=1)
+def published_manifest():
+    """Manifeste lu une fois par exécution, pour les publieurs."""
+    return load_manifest()
+
+
+def css_dependencies(path, source):
+    """URLs des .css importés par `source` (pour l'ordre de construction)."""
+    url = "/" + path.as_posix()
+    deps = set()
+    for _, _, target in CSS_URL.findall(source):
+        if target.endswith(".css") and not target.startswith(("http:", "https:", "data:")):
+            deps.add(target if target.startswith("/") else posixpath.normpath(
+                posixpath.join(posixpath.dirname(url), target)
+            ))
+    return deps
+
+
+def build_assets():
+    """
+    Minifie et versionne toutes les sources ; retourne
+    (manifeste {URL source: URL versionnée}, fichiers écrits, supprimés).
+    """
+    sources = {}
+    for directory, ext in SOURCES:
+        for path in sorted(Path(directory).glob(f"*{ext}")):
+            sources["/" + path.as_posix()] = path
+
+    Path(DIST_DIR).mkdir(parents=True, exist_ok=True)
+    urls, ecrits = {}, []
+    restants = dict(sources)
+    while restants:
+        # Un CSS est construit après ceux qu'il importe : leur URL versionnée
+        # fait partie de son contenu, donc de son hash.
+        prets = [
+            url for url, path in restants.items()
+            if path.suffix != ".css"
+            or not (css_dependencies(path, path.read_text(encoding="utf-8"))
+                    & set(restants) - {url})
+        ] or list(restants)
+        for url in prets:
+            path = restants.pop(url)
+            source = path.read_text(encoding="utf-8")
+            if path.suffix == ".css":
+                contenu = rewrite_css_urls(minify_css(source), url, urls)
+            else:
+                contenu = minify_js(source)
+            digest = hashlib.sha256(contenu.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+            cible = Path(DIST_DIR) / f"{path.stem}.{digest}.min{path.suffix}"
+            if not cible.exists():
+                cible.write_text(contenu, encoding="utf-8")
+                ecrits.append(cible.as_posix())
+            urls[url] = "/" + cible.as_posix()
+
+    # Anciennes versions : tout fichier de assets/dist/ absent du manifeste
+    gardes = {u.lstrip("/") for u in urls.values()}
+    supprimes = []
+    for path in Path(DIST_DIR).iterdir():
+        if path.as_posix() not in gardes:
+            path.unlink()
+            supprimes.append(path.as_posix())
+
+    if load_manifest() != urls:
+        Path(MANIFEST_PATH).write_text(
+            json.dumps(urls, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        ecrits.append(MANIFEST_PATH)
+    return urls, ecrits, supprimes
+
+
+# ═════════════════════════════════════════════════════════
+# RÉÉCRITURE DES RÉFÉRENCES
+# ═════════════════════════════════════════════════════════
+SOURCE_DIRS = "|".join(re.escape(d) for d, _ in SOURCES)
+ASSET_URL = re.compile(
+    rf"""(["'])(?:(/(?:{SOURCE_DIRS})/[^"'/]+)"""
+    rf"""|/{re.escape(DIST_DIR)}/([^"'/]+?)\.[0-9a-f]+\.min(\.css|\.js))\1"""
+)
+
+
+def rewrite_asset_urls(html, urls=None):
+    """
+    Remplace chaque URL CSS/JS, d'origine (/assets/css/main.css) ou
+    périmée (/assets/dist/main.<ancien hash>.min.css), par sa version
+    courante du manifeste.
+    """
+    urls = published_manifest() if urls is None else urls
+    if not urls:
+        return html
+    par_nom = {posixpath.splitext(posixpath.basename(u)): u for u in urls}
+
+    def repl(m):
+        quote, source, stem, ext = m.groups()
+        if source is None:
+            source = par_nom.get((stem, ext))
+        if source not in urls:
+            return m.group(0)
+        return f"{quote}{urls[source]}{quote}"
+
+    return ASSET_URL.sub(repl, html)
+
+
+def rewrite_static_pages(urls):
+    modifiees = []
+    for path in walk_pages():
+        html = Path(path).read_text(encoding="utf-8")
+        nouveau = rewrite_asset_urls(html, urls)
+        if nouveau != html:
+            Path(path).write_text(nouveau, encoding="utf-8")
+            modifiees.append(path)
+    return modifiees
+
+
+# ═════════════════════════════════════════════════════════
+# EN-TÊTES VERCEL
+# ═════════════════════════════════════════════════════════
+def ensure_cache_headers(path=VERCEL_PATH):
+    """Ajoute la règle immutable de /assets/dist/ à vercel.json si absente."""
+    source = f"/{DIST_DIR}/(.*)"
+    config = json.loads(Path(path).read_text(encoding="utf-8"))
+    headers = config.setdefault("headers", [])
+    if any(rule.get("source") == source for rule in headers):
+        return False
+    headers.append({
+        "source": source,
+        "headers": [{"key": "Cache-Control", "value": CACHE_CONTROL}],
+    })
+    Path(path).write_text(json.dumps(config, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return True
+
+
+# ═════════════════════════════════════════════════════════
+# GIT / MAIN
+# ═════════════════════════════════════════════════════════
+def git_commit_and_push(paths):
+    try:
+        subprocess.run(["git", "config", "user.name", "Assets Bot"], check=True)
+        subprocess.run(["git", "config", "user.email", "bot@lauraballo.com"], check=True)
+        subprocess.run(["git", "add", "-A", "--", *paths], check=True)
+        subprocess.run(["git", "commit", "-m", "🎨 Assets versionnés"], check=True)
+        subprocess.run(["git", "push"], check=True)
+        print("  ✅ Push réussi")
+    except subprocess.CalledProcessError as e:
+        print(f"  ❌ Erreur git : {e}")
+
+
+def main():
+    print("═" * 55)
+    print("  Assets versionnés (CSS / JS)")
+    print("═" * 55)
+    debut = time.perf_counter()
+    urls, ecrits, supprimes = build_assets()
+    for source, cible in sorted(urls.items()):
+        avant = Path(source.lstrip("/")).stat().st_size
+        apres = Path(cible.lstrip("/")).stat().st_size
+        print(f"  {source:40s} → {cible}  ({avant // 1024}KB → {apres // 1024}KB)")
+    pages = rewrite_static_pages(urls)
+    vercel = ensure_cache_headers()
+    print(
+        f"\n🎨 {len(ecrits)} fichier(s) écrit(s), {len(supprimes)} ancienne(s) version(s) "
+        f"supprimée(s), {len(pages)} page(s) réécrite(s) en "
+        f"{(time.perf_counter() - debut) * 1000:.0f} ms"
+    )
+    touches = ecrits + supprimes + pages + ([VERCEL_PATH] if vercel else [])
+    if touches:
+        print("\n🚀 Commit & push...")
+        git_commit_and_push([DIST_DIR, MANIFEST_PATH, VERCEL_PATH, *pages])
+    print("═" * 55)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+═══════════════════════════════════════════════════════════
+  CSS critique des articles — Laura Ballo Coaching
+═══════════════════════════════════════════════════════════
+  Utilisé par publish.py (generate_html).
+
+  Le <head> de _templates/article.html charge plusieurs feuilles de
+  style bloquantes. Pour le gabarit (composants intégrés compris), on
+  garde les règles dont les sélecteurs peuvent viser le balisage situé
+  avant {{CONTENT}} (navigation + hero), avec :root, html, body, *,
+  @font-face et les @keyframes qu'elles utilisent :
+
+    <style id="critical-css">…</style>      dans le <head>
+    <link rel="preload" as="style" onload="…rel='stylesheet'">
+    <noscript><link rel="stylesheet"></noscript>
+
+  Calcul une fois par gabarit : en mémoire pour le run, et sur disque
+  sous .cache/critical-css/<hash>.css (CRITICAL_CSS_CACHE_DIR), le hash
+  couvrant le gabarit et le contenu de chaque feuille (@import compris).
+  CRITICAL_CSS=0 désactive l'étape.
+═══════════════════════════════════════════════════════════
+"""
+
+import functools
+import hashlib
+import os
+import posixpath
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+
+from build_assets import minify_css, rewrite_css_urls
+from inline_components import inline_components
+
+# ─────────────────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────────────────
+CACHE_DIR = os.environ.get("CRITICAL_CSS_CACHE_DIR") or ".cache/critical-css"
+ENABLED = (os.environ.get("CRITICAL_CSS") or "1") != "0"
+FOLD_MARKER = "{{CONTENT}}"     # tout ce qui précède est « au-dessus de la ligne »
+
+STYLESHEET_RE = re.compile(
+    r'[ \t]*<link rel="stylesheet" href="(/assets/[^"]+\.css)">[ \t]*\n?'
+)
+IMPORT_RE = re.compile(r"""@import\s+(?:url\()?\s*["']?([^"')\s;]+)["']?\s*\)?\s*;""")
+COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+PSEUDO_RE = re.compile(r"::?[\w-]+(\((?:[^()]|\([^()]*\))*\))?")
+ATTRIBUTE_RE = re.compile(r"\[[^\]]*\]")
+SIMPLE_RE = re.compile(r"([.#]?)(-?[_a-zA-Z][\w-]*)")
+ANIMATION_RE = re.compile(r"animation(?:-name)?\s*:\s*([^;}]+)")
+
+
+# ═════════════════════════════════════════════════════════
+# BALISAGE AU-DESSUS DE LA LIGNE
+# ═════════════════════════════════════════════════════════
+class _Collector(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.tags, self.classes, self.ids = {"html", "body"}, set(), set()
+
+    def handle_starttag(self, tag, attrs):
+        self.tags.add(tag)
+        for name, value in attrs:
+            if name == "class" and value:
+                self.classes.update(value.split())
+            elif name == "id" and value:
+                self.ids.add(value)
+
+
+def above_the_fold(template):
+    """(balises, classes, ids) du <body> jusqu'à {{CONTENT}}."""
+    html = inline_components(template)
+    start = html.find("<body")
+    end = html.find(FOLD_MARKER)
+    collector = _Collector()
+    collector.feed(html[max(start, 0):end if end >= 0 else len(html)])
+    return collector.tags, collector.classes, collector.ids
+
+
+# ═════════════════════════════════════════════════════════
+# LECTURE ET DÉCOUPAGE DES FEUILLES
+# ═════════════════════════════════════════════════════════
+def read_stylesheet(url, seen=None):
+    """CSS de `url` (chemin /assets/…), @import locaux remplacés par leur contenu."""
+    seen = seen if seen is not None else set()
+    if url in seen:
+        return ""
+    seen.add(url)
+    path = Path(url.lstrip("/"))
+    if not path.exists():
+        return ""
+    css = COMMENT_RE.sub("", path.read_text(encoding="utf-8"))
+
+    def repl(m):
+        target = m.group(1)
+        if target.startswith(("http:", "https:", "//")):
+            return m.group(0)
+        absolute = target if target.startswith("/") else posixpath.normpath(
+            posixpath.join(posixpath.dirname(url), target)
+        )
+        return read_stylesheet(absolute, seen)
+
+    css = IMPORT_RE.sub(repl, css)
+    # url() relatifs → absolus : le CSS ne sera plus servi depuis son dossier
+    return rewrite_css_urls(css, url, {})
+
+
+def _block_end(css, i):
+    """Index de l'accolade fermante qui correspond à celle en css[i]."""
+    depth, quote = 0, None
+    while i < len(css):
+        c = css[i]
+        if quote:
+            if c == "\\":
+                i += 1
+            elif c == quote:
+                quote = None
+        elif c in "'\"":
+            quote = c
+        elif c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return len(css)
+
+
+def parse_css(css):
+    """[(type, prélude, corps)] : rule, group (@media/@supports → liste), at, stmt."""
+    nodes, i = [], 0
+    while i < len(css):
+        brace, semi = css.find("{", i), css.find(";", i)
+        if brace < 0 and semi < 0:
+            break
+        if semi >= 0 and (brace < 0 or semi < brace):
+            nodes.append(("stmt", css[i:semi].strip(), None))
+            i = semi + 1
+            continue
+        end = _block_end(css, brace)
+        prelude, body = css[i:brace].strip(), css[brace + 1:end]
+        if prelude.startswith(("@media", "@supports")):
+            nodes.append(("group", prelude, parse_css(body)))
+        elif prelude.startswith("@"):
+            nodes.append(("at", prelude, body))
+        else:
+            nodes.append(("rule", prelude, body))
+        i = end + 1
+    return nodes
+
+
+# ═════════════════════════════════════════════════════════
+# SÉLECTION
+# ═════════════════════════════════════════════════════════
+def selector_used(selector, tags, classes, ids):
+    """
+    Condition nécessaire : chaque balise, classe et id du sélecteur existe
+    dans le balisage (la structure n'est pas vérifiée — on garde large).
+    """
+    simple = PSEUDO_RE.sub("", ATTRIBUTE_RE.sub("", selector))
+    for prefix, name in SIMPLE_RE.findall(simple):
+        if prefix == "." and name not in classes:
+            return False
+        if prefix == "#" and name not in ids:
+            return False
+        if not prefix and name.lower() not in tags:
+            return False
+    return True
+
+
+def select(nodes, used):
+    kept = []
+    for kind, prelude, body in nodes:
+        if kind == "rule":
+            if any(selector_used(s, *used) for s in prelude.split(",")):
+                kept.append(f"{prelude}{{{body}}}")
+        elif kind == "group":
+            inner = select(body, used)
+            if inner:
+                kept.append(f"{prelude}{{{''.join(inner)}}}")
+        elif kind == "at" and prelude.startswith("@font-face"):
+            kept.append(f"{prelude}{{{body}}}")
+    return kept
+
+
+def keyframes_for(nodes, css):
+    """@keyframes dont le nom est référencé par `css`."""
+    names = {
+        token for value in ANIMATION_RE.findall(css)
+        for token in re.findall(r"[\w-]+", value)
+    }
+    kept = []
+    for kind, prelude, body in nodes:
+        if kind == "at" and prelude.split()[0].endswith("keyframes"):
+            if len(prelude.split()) > 1 and prelude.split()[1] in names:
+                kept.append(f"{prelude}{{{body}}}")
+        elif kind == "group":
+            kept.extend(keyframes_for(body, css))
+    return kept
+
+
+def extract_critical_css(template, stylesheets):
+    used = above_the_fold(template)
+    nodes = []
+    for url in stylesheets:
+        nodes.extend(parse_css(read_stylesheet(url)))
+    critical = "".join(select(nodes, used))
+    critical += "".join(keyframes_for(nodes, critical))
+    return minify_css(critical).strip()
+
+
+# ═════════════════════════════════════════════════════════
+# GABARIT AVEC CSS CRITIQUE
+# ═════════════════════════════════════════════════════════
+def cache_key(template, stylesheets):
+    digest = hashlib.sha256(template.encode("utf-8"))
+    for url in stylesheets:
+        seen = set()
+        digest.update(url.encode("utf-8"))
+        digest.update(read_stylesheet(url, seen).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def write_cache(cache, critical):
+    """
+    Écrit via un .tmp propre au processus puis os.replace : les workers de
+    rerender_from_cache qui lisent le même fichier ne voient jamais un
+    fichier tronqué ou à moitié écrit.
+    """
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+    tmp.write_text(critical, encoding="utf-8")
+    os.replace(tmp, cache)
+
+
+@functools.lru_cache(maxsize=4)
+def critical_template(template):
+    """
+    `template` avec le CSS critique inliné et les feuilles chargées sans
+    bloquer le rendu. Inchangé si aucune feuille locale n'est liée.
+    """
+    if not ENABLED:
+        return template
+    stylesheets = STYLESHEET_RE.findall(template)
+    if not stylesheets:
+        return template
+
+    cache = Path(CACHE_DIR) / f"{cache_key(template, stylesheets)}.css"
+    critical = cache.read_text(encoding="utf-8") if cache.exists() else ""
+    if not critical:             # absent, ou vide : traité comme un échec de cache
+        critical = extract_critical_css(template, stylesheets)
+        write_cache(cache, critical)
+        total = sum(len(read_stylesheet(url)) for url in stylesheets)
+        print(f"🎯 CSS critique : {len(critical) // 1024}KB sur {total // 1024}KB ({cache.name[:12]})")
+
+    links = "".join(
+        f'  <link rel="preload" href="{url}" as="style" '
+        f"onload=\"this.onload=null;this.rel='stylesheet'\">\n"
+        f'  <noscript><link rel="stylesheet" href="{url}"></noscript>\n'
+        for url in stylesheets
+    )
+    head = f'  <style id="critical-css">{critical}</style>\n{links}'
+    premier = True
+
+    def repl(m):
+        nonlocal premier
+        if premier:
+            premier = False
+            return head
+        return ""
+
+    return STYLESHEET_RE.sub(repl, template)
@@ -5,7 +5,22 @@
 ═══════════════════════════════════════════════════════════
   Scanne tous les fichiers .html du projet,
   intègre les articles depuis blog/articles.json,
-  recrée sitemap.xml à zéro, puis commit sur GitHub.
+  recrée les sitemaps à zéro, puis commit sur GitHub.
+
+  Les URLs sont écrites au fil de l'eau (mémoire constante), échappées
+  en XML, et réparties en :
+    sitemap-pages.xml, sitemap-articles.xml, sitemap-formations.xml
+  chacun découpé en sitemap-<nom>-2.xml… au-delà de 50 000 URLs ou
+  50 Mo, et référencés par sitemap_index.xml.
+  SITEMAP_GZIP=1 : copie .xml.gz à côté de chaque fichier.
+
+  <lastmod> d'une page = date de sa dernière modification réelle :
+    1. contenu identique (SHA-256) à celui du manifeste → date connue
+    2. sinon date du dernier commit git du fichier (s'il est propre
+       et que l'historique n'est pas tronqué)
+    3. sinon la date du jour
+  Manifeste : .cache/sitemap-manifest.json (SITEMAP_MANIFEST_PATH).
+  Un sitemap identique à l'octet près n'est ni réécrit ni commité.
 
   Usage (GitHub Action) : chaîné après publish.py
   Usage (local) :
@@ -13,17 +28,32 @@
 ═══════════════════════════════════════════════════════════
 """
 
+import filecmp
+import gzip
+import hashlib
 import json
+import os
+import re
+import shutil
 import subprocess
+import time
 from datetime import datetime, timezone
 from pathlib import Path
+from xml.sax.saxutils import escape
 
 # ─────────────────────────────────────────────────────────
 # CONFIG
 # ─────────────────────────────────────────────────────────
 SITE_URL = "https://lauraballo.com"
-SITEMAP_PATH = "sitemap.xml"
+SITEMAP_INDEX_PATH = "sitemap_index.xml"
+SHARDS = ("pages", "articles", "formations")
+MAX_URLS = 50_000                     # limites du protocole sitemaps.org
+MAX_BYTES = 50 * 1024 * 1024
+GZIP = (os.environ.get("SITEMAP_GZIP") or "0") == "1"
+SITEMAP_GLOB = "sitemap*.xml*"        # pathspec git : index, fragments, .gz
 ARTICLES_JSON_PATH = "blog/articles.json"
+ARTICLES_DIR = "blog/articles"
+MANIFEST_PATH = os.environ.get("SITEMAP_MANIFEST_PATH") or ".cache/sitemap-manifest.json"
 
 # Dossiers et fichiers exclus du scan
 EXCLUDED_PATHS = {
@@ -50,25 +80,59 @@ PRIORITIES = [
 ]
 DEFAULT_PRIORITY = ("monthly", "0.6")
 
+URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+).encode("utf-8")
+URLSET_CLOSE = b"</urlset>\n"
+
 
 # ─────────────────────────────────────────────────────────
 # SCAN DES PAGES STATIQUES
 # ─────────────────────────────────────────────────────────
-def discover_static_pages():
-    pages = []
-    root = Path(".")
-
-    for html_file in sorted(root.rglob("*.html")):
-        path_str = str(html_file).replace("\\", "/").lstrip("./")
-
-        # Exclure dossiers/fichiers blacklistés
-        if any(excl in path_str for excl in EXCLUDED_PATHS):
+# Règles compilées une fois : un chemin est exclu s'il contient l'une des
+# entrées de EXCLUDED_PATHS ; un dossier qui en contient une est élagué
+# (tous ses descendants la contiendraient aussi).
+EXCLUDED_RE = re.compile("|".join(re.escape(p) for p in sorted(EXCLUDED_PATHS)))
+HIDDEN_PREFIXES = (".", "_")
+
+
+def walk_html(directory="", stats=None):
+    """
+    Chemins relatifs (séparateur /) des .html sous `directory`, dans l'ordre
+    de sorted(rglob) : les dossiers exclus ou cachés ne sont jamais ouverts.
+    """
+    stats = stats if stats is not None else {}
+    stats["dirs"] = stats.get("dirs", 0) + 1
+    with os.scandir(directory or ".") as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        if entry.name.startswith(HIDDEN_PREFIXES):
             continue
-        if any(part.startswith((".", "_")) for part in html_file.parts):
-            continue
-        if html_file.name in EXCLUDED_FILES:
-            continue
-
+        rel = f"{directory}/{entry.name}" if directory else entry.name
+        if entry.is_dir(follow_symlinks=False):
+            if EXCLUDED_RE.search(rel):
+                stats["pruned"] = stats.get("pruned", 0) + 1
+                continue
+            yield from walk_html(rel, stats)
+        elif (
+            entry.name.endswith(".html")
+            and entry.name not in EXCLUDED_FILES
+            and not EXCLUDED_RE.search(rel)
+        ):
+            yield rel
+
+
+def discover_static_pages(stats=None):
+    """
+    Génère les pages au fil du scan : {path, loc, changefreq, priority}.
+    `stats` reçoit dossiers parcourus / élagués et la durée du scan seul.
+    """
+    stats = stats if stats is not None else {}
+    stats.update(dirs=0, pruned=0, pages=0, duration=0.0)
+    debut = time.perf_counter()
+
+    for path_str in walk_html("", stats):
         # Construire l'URL propre
         loc = "/" + path_str
         if loc.endswith("/index.html"):
@@ -83,9 +147,15 @@ def discover_static_pages():
                 changefreq, priority = cf, prio
                 break
 
-        pages.append({"loc": loc, "changefreq": changefreq, "priority": priority})
+        stats["pages"] += 1
+        stats["duration"] += time.perf_counter() - debut
+        yield {
+            "path": path_str, "loc": loc,
+            "changefreq": changefreq, "priority": priority,
+        }
+        debut = time.perf_counter()
 
-    return pages
+    stats["duration"] += time.perf_counter() - debut
 
 
 # ─────────────────────────────────────────────────────────
@@ -101,48 +171,242 @@ def load_articles():
 
 
 # ─────────────────────────────────────────────────────────
-# GÉNÉRATION DU SITEMAP
+# DATES DE MODIFICATION
 # ─────────────────────────────────────────────────────────
-def generate_sitemap(static_pages, articles):
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+def load_manifest():
+    try:
+        return json.loads(Path(MANIFEST_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    Path(MANIFEST_PATH).parent.mkdir(parents=True, exist_ok=True)
+    Path(MANIFEST_PATH).write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+
+
+def file_sha256(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
 
-    lines = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
-    ]
 
-    # Pages statiques
-    lines.append("")
-    lines.append("  <!-- Pages statiques -->")
+def git_dates():
+    """
+    {chemin: date du dernier commit} pour tous les fichiers suivis, en un
+    seul `git log`, plus l'ensemble des fichiers modifiés non commités.
+    Historique tronqué (clone superficiel) ou pas de git → ({}, set()).
+    """
+    def git(*args):
+        return subprocess.run(
+            ["git", "-c", "core.quotepath=off", *args],
+            capture_output=True, text=True, check=True,
+        ).stdout
+
+    try:
+        if git("rev-parse", "--is-shallow-repository").strip() == "true":
+            print("   ⚠️  Clone superficiel : dates git ignorées")
+            return {}, set()
+        log = git("log", "--format=%x00%cs", "--name-only", "--no-renames")
+        status = git("status", "--porcelain", "-z", "--untracked-files=all")
+    except (OSError, subprocess.CalledProcessError):
+        return {}, set()
+
+    dates, date = {}, None
+    for line in log.splitlines():
+        if line.startswith("\x00"):
+            date = line[1:]
+        elif line:
+            dates.setdefault(line, date)
+    dirty = {entry[3:] for entry in status.split("\0") if len(entry) > 3}
+    return dates, dirty
+
+
+def resolve_lastmod(path, manifest, dates, dirty, today):
+    """Date de dernière modification de `path`, mémorisée dans `manifest`."""
+    digest = file_sha256(path)
+    entry = manifest.get(path)
+    if entry and entry.get("sha256") == digest:
+        return entry["lastmod"]
+    if path in dates and path not in dirty:
+        lastmod = dates[path]
+    else:
+        lastmod = today
+    manifest[path] = {"sha256": digest, "lastmod": lastmod}
+    return lastmod
+
+
+class LastMods:
+    """Résolution des <lastmod> d'un run ; seuls les chemins vus sont conservés."""
+
+    def __init__(self):
+        self.today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        self.previous = load_manifest()
+        self.manifest = {}
+        self.dates, self.dirty = git_dates()
+
+    def page(self, path):
+        if path in self.previous:
+            self.manifest[path] = self.previous[path]
+        return resolve_lastmod(path, self.manifest, self.dates, self.dirty, self.today)
+
+    def article(self, article):
+        """Date de publication, ou date de modification du HTML si plus récente."""
+        date = article.get("date") or self.today
+        html_file = f"{ARTICLES_DIR}/{article['slug']}.html"
+        if Path(html_file).exists():
+            date = max(date, self.page(html_file))
+        return date
+
+    def save(self):
+        save_manifest(self.manifest)
+
+
+# ─────────────────────────────────────────────────────────
+# ÉCRITURE DES SITEMAPS
+# ─────────────────────────────────────────────────────────
+def url_entry(loc, lastmod, changefreq, priority):
+    return (
+        "  <url>\n"
+        f"    <loc>{escape(SITE_URL + loc)}</loc>\n"
+        f"    <lastmod>{escape(lastmod)}</lastmod>\n"
+        f"    <changefreq>{changefreq}</changefreq>\n"
+        f"    <priority>{priority}</priority>\n"
+        "  </url>\n"
+    ).encode("utf-8")
+
+
+def replace_if_changed(path):
+    """
+    Remplace `path` par `path`.tmp si leur contenu diffère (sinon supprime
+    le .tmp) et tient à jour la copie gzip. Retourne True si `path` a changé.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    if path.exists() and filecmp.cmp(tmp, path, shallow=False):
+        tmp.unlink()
+        changed = False
+    else:
+        os.replace(tmp, path)
+        changed = True
+    gz = path.with_name(path.name + ".gz")
+    if GZIP and (changed or not gz.exists()):
+        # mtime=0 et pas de nom de fichier : copie gzip reproductible
+        with open(path, "rb") as src, open(gz, "wb") as raw:
+            with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as dst:
+                shutil.copyfileobj(src, dst)
+        changed = True
+    elif not GZIP and gz.exists():
+        gz.unlink()
+        changed = True
+    return changed
+
+
+class SitemapWriter:
+    """
+    <urlset> écrit au fil de l'eau dans sitemap-<nom>.xml, découpé en
+    sitemap-<nom>-2.xml… au-delà de MAX_URLS URLs ou MAX_BYTES octets.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.files = []          # [(chemin, lastmod le plus récent)]
+        self.changed = False
+        self.total = 0
+        self.out = None
+
+    def path(self, n):
+        suffix = "" if n == 1 else f"-{n}"
+        return Path(f"sitemap-{self.name}{suffix}.xml")
+
+    def add(self, loc, lastmod, changefreq, priority):
+        entry = url_entry(loc, lastmod, changefreq, priority)
+        if (
+            self.out is None
+            or self.count >= MAX_URLS
+            or self.size + len(entry) + len(URLSET_CLOSE) > MAX_BYTES
+        ):
+            self._finish()
+            self._start()
+        self.out.write(entry)
+        self.count += 1
+        self.size += len(entry)
+        self.lastmod = max(self.lastmod, lastmod)
+        self.total += 1
+
+    def _start(self):
+        self.current = self.path(len(self.files) + 1)
+        self.out = open(self.current.with_name(self.current.name + ".tmp"), "wb")
+        self.out.write(URLSET_OPEN)
+        self.count, self.size, self.lastmod = 0, len(URLSET_OPEN), ""
+
+    def _finish(self):
+        if self.out is None:
+            return
+        self.out.write(URLSET_CLOSE)
+        self.out.close()
+        self.out = None
+        self.changed |= replace_if_changed(self.current)
+        self.files.append((self.current, self.lastmod))
+
+    def close(self):
+        """Termine le fichier en cours et supprime les fragments devenus inutiles."""
+        self._finish()
+        written = {path.name for path, _ in self.files}
+        for stale in Path(".").glob(f"sitemap-{self.name}*.xml*"):
+            base = stale.name.removesuffix(".gz")
+            if base not in written and re.fullmatch(
+                rf"sitemap-{re.escape(self.name)}(-\d+)?\.xml", base
+            ):
+                stale.unlink()
+                self.changed = True
+
+
+def write_index(writers):
+    """sitemap_index.xml : un <sitemap> par fichier écrit. True s'il a changé."""
+    tmp = Path(SITEMAP_INDEX_PATH + ".tmp")
+    with open(tmp, "w", encoding="utf-8", newline="\n") as out:
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        out.write('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        for writer in writers:
+            for path, lastmod in writer.files:
+                out.write(
+                    "  <sitemap>\n"
+                    f"    <loc>{escape(SITE_URL + '/' + path.name)}</loc>\n"
+                    f"    <lastmod>{escape(lastmod)}</lastmod>\n"
+                    "  </sitemap>\n"
+                )
+        out.write("</sitemapindex>\n")
+    return replace_if_changed(SITEMAP_INDEX_PATH)
+
+
+def generate_sitemap(static_pages, articles, lastmods):
+    """
+    Écrit les sitemaps à mesure que les URLs arrivent (`static_pages` et
+    `articles` peuvent être des générateurs). Retourne ({fragment: nombre
+    d'URLs}, True si au moins un fichier a changé).
+    """
+    writers = {name: SitemapWriter(name) for name in SHARDS}
+
     for page in static_pages:
-        lines += [
-            "  <url>",
-            f"    <loc>{SITE_URL}{page['loc']}</loc>",
-            f"    <lastmod>{today}</lastmod>",
-            f"    <changefreq>{page['changefreq']}</changefreq>",
-            f"    <priority>{page['priority']}</priority>",
-            "  </url>",
-        ]
-
-    # Articles de blog
-    lines.append("")
-    lines.append("  <!-- Articles de blog -->")
+        shard = "formations" if page["path"].startswith("formations/") else "pages"
+        writers[shard].add(
+            page["loc"], lastmods.page(page["path"]),
+            page["changefreq"], page["priority"],
+        )
+
     for article in sorted(articles, key=lambda a: a.get("date", ""), reverse=True):
         slug = article.get("slug", "")
-        date = article.get("date", today)
         if not slug:
             continue
-        lines += [
-            "  <url>",
-            f"    <loc>{SITE_URL}/{slug}</loc>",
-            f"    <lastmod>{date}</lastmod>",
-            "    <changefreq>monthly</changefreq>",
-            "    <priority>0.7</priority>",
-            "  </url>",
-        ]
+        writers["articles"].add(f"/{slug}", lastmods.article(article), "monthly", "0.7")
 
-    lines += ["", "</urlset>"]
-    Path(SITEMAP_PATH).write_text("\n".join(lines) + "\n", encoding="utf-8")
+    for writer in writers.values():
+        writer.close()
+    changed = write_index(writers.values())
+    changed = any(w.changed for w in writers.values()) or changed
+    return {name: w.total for name, w in writers.items()}, changed
 
 
 # ─────────────────────────────────────────────────────────
@@ -152,8 +416,11 @@ def git_commit_and_push():
     try:
         subprocess.run(["git", "config", "user.name", "Sitemap Bot"], check=True)
         subprocess.run(["git", "config", "user.email", "bot@lauraballo.com"], check=True)
-        subprocess.run(["git", "add", SITEMAP_PATH], check=True)
-        result = subprocess.run(["git", "status", "--porcelain"], capture_output=True, text=True)
+        subprocess.run(["git", "add", "-A", "--", SITEMAP_GLOB], check=True)
+        result = subprocess.run(
+            ["git", "status", "--porcelain", "--", SITEMAP_GLOB],
+            capture_output=True, text=True,
+        )
         if not result.stdout.strip():
             print("  ℹ️  Sitemap inchangé — aucun commit nécessaire.")
             return
@@ -172,18 +439,26 @@ def main():
     print("  Sitemap Generator")
     print("═" * 55)
 
-    static_pages = discover_static_pages()
-    print(f"📄 {len(static_pages)} pages statiques trouvées")
-
     articles = load_articles()
     print(f"📝 {len(articles)} articles chargés depuis {ARTICLES_JSON_PATH}")
 
-    generate_sitemap(static_pages, articles)
-    total = len(static_pages) + len(articles)
-    print(f"🗺️  {SITEMAP_PATH} régénéré — {total} URLs au total")
-
-    print("\n🚀 Commit & push...")
-    git_commit_and_push()
+    lastmods = LastMods()
+    scan = {}
+    counts, changed = generate_sitemap(discover_static_pages(scan), articles, lastmods)
+    lastmods.save()
+    print(
+        f"🔎 {scan['pages']} pages statiques trouvées en {scan['duration'] * 1000:.1f} ms "
+        f"({scan['dirs']} dossier(s) parcouru(s), {scan['pruned']} élagué(s))"
+    )
+    for name, count in counts.items():
+        print(f"📄 sitemap-{name} : {count} URL(s)")
+    total = sum(counts.values())
+    if not changed:
+        print(f"🗺️  Sitemaps identiques — {total} URLs, aucun commit nécessaire.")
+    else:
+        print(f"🗺️  {SITEMAP_INDEX_PATH} régénéré — {total} URLs au total")
+        print("\n🚀 Commit & push...")
+        git_commit_and_push()
 
     print("═" * 55)
     print("  ✅ Terminé")
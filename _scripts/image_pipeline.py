@@ -0,0 +1,286 @@
+"""
+═══════════════════════════════════════════════════════════
+  Étape images des articles — Laura Ballo Coaching
+═══════════════════════════════════════════════════════════
+  Utilisée par publish.py. Reçoit la liste (url, nom de fichier) des
+  images d'un article et produit les WebP dans assets/img/blog/.
+
+    1. Téléchargements en parallèle (threads), corps des réponses
+       écrits en streaming sur disque, SHA-256 calculé au passage
+    2. Source inchangée (même SHA-256 et mêmes réglages que dans le
+       manifeste) et WebP présent → aucun ré-encodage
+    3. Sinon décodage / encodage WebP dans un pool de processus :
+       l'original pleine taille, plus une déclinaison par largeur de
+       l'échelle IMAGE_WIDTHS (480/960/1440/1920) inférieure à l'original
+       → <nom>-<largeur>w.webp
+
+  Chaque image est décrite par un dict {url, width, height, srcset}
+  que publish.py transforme en attributs srcset / sizes / width / height.
+
+  IMAGE_ENCODER_MODE=search : au lieu de la qualité fixe, la qualité
+  WebP et AVIF est cherchée image par image (voir image_quality.py).
+  Si l'AVIF est plus léger, il est écrit à côté (<nom>.avif, variantes
+  comprises) et la description gagne un `avif_srcset` → <picture>.
+
+  Manifeste : .cache/images-manifest.json (IMAGES_MANIFEST_PATH).
+
+  known_images : même retour, sans réseau — pour un re-rendu depuis le
+  cache, les images déjà produites sont décrites d'après le manifeste.
+═══════════════════════════════════════════════════════════
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from PIL import Image
+
+import image_quality
+
+# ─────────────────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────────────────
+MANIFEST_PATH = os.environ.get("IMAGES_MANIFEST_PATH") or ".cache/images-manifest.json"
+DOWNLOAD_DIR = os.environ.get("IMAGES_DOWNLOAD_DIR") or ".cache/images-src"
+DOWNLOAD_WORKERS = int(os.environ.get("IMAGES_DOWNLOAD_WORKERS") or 4)
+ENCODE_WORKERS = int(os.environ.get("IMAGES_ENCODE_WORKERS") or os.cpu_count() or 1)
+CHUNK_SIZE = 64 * 1024
+WIDTHS = tuple(
+    int(w) for w in (os.environ.get("IMAGE_WIDTHS") or "480,960,1440,1920").split(",")
+    if w.strip()
+)
+ENCODER_MODE = os.environ.get("IMAGE_ENCODER_MODE") or "fixed"   # fixed | search
+
+
+# ═════════════════════════════════════════════════════════
+# MANIFESTE
+# ═════════════════════════════════════════════════════════
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True),
+        encoding="utf-8",
+    )
+
+
+# ═════════════════════════════════════════════════════════
+# TÉLÉCHARGEMENT (threads)
+# ═════════════════════════════════════════════════════════
+def download(session, url, dest):
+    """Écrit le corps de la réponse dans `dest` par blocs ; retourne son SHA-256."""
+    digest = hashlib.sha256()
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with session.get(url, timeout=20, stream=True) as resp:
+        resp.raise_for_status()
+        with open(dest, "wb") as f:
+            for chunk in resp.iter_content(CHUNK_SIZE):
+                digest.update(chunk)
+                f.write(chunk)
+    return digest.hexdigest()
+
+
+# ═════════════════════════════════════════════════════════
+# ENCODAGE (processus)
+# ═════════════════════════════════════════════════════════
+def variant_path(dst, width):
+    dst = Path(dst)
+    return dst.with_name(f"{dst.stem}-{width}w{dst.suffix}")
+
+
+def encode_image(src, dst, quality, widths=WIDTHS, mode=ENCODER_MODE):
+    """
+    Décode `src`, écrit l'original en WebP dans `dst` puis une déclinaison
+    par largeur de `widths` plus petite que l'original. En mode search, les
+    qualités viennent de image_quality.best_encodings et un AVIF est écrit
+    s'il est plus léger ; les variantes reprennent les qualités trouvées.
+    Retourne {width, height, size, variants, qualities}.
+    """
+    dst = Path(dst)
+    with Image.open(src) as img:
+        if img.mode in ("RGBA", "P"):
+            img = img.convert("RGB")
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        if mode == "search":
+            best = image_quality.best_encodings(img)
+            for fmt, (_, data, _) in best.items():
+                dst.with_suffix(image_quality.EXTENSIONS[fmt]).write_bytes(data)
+            qualities = {fmt: q for fmt, (q, _, _) in best.items()}
+        else:
+            img.save(dst, "WEBP", quality=quality)
+            qualities = {"WEBP": quality}
+        width, height = img.width, img.height
+        produites = []
+        for w in sorted(widths):
+            if w >= width:
+                continue
+            h = max(1, round(height * w / width))
+            resized = img.resize((w, h), Image.LANCZOS)
+            for fmt, q in qualities.items():
+                target = variant_path(dst.with_suffix(image_quality.EXTENSIONS[fmt]), w)
+                resized.save(target, fmt, quality=q)
+            produites.append(w)
+    return {
+        "width": width,
+        "height": height,
+        "size": dst.stat().st_size,
+        "variants": produites,
+        "qualities": qualities,
+    }
+
+
+def outputs_exist(output_path, entry):
+    """Tous les fichiers décrits par l'entrée du manifeste sont-ils présents ?"""
+    for fmt in entry.get("qualities", {"WEBP": None}):
+        base = output_path.with_suffix(image_quality.EXTENSIONS[fmt])
+        paths = [base] + [variant_path(base, w) for w in entry.get("variants", [])]
+        if not all(p.exists() for p in paths):
+            return False
+    return True
+
+
+def describe(images_dir, name, entry):
+    """Dict {url, width, height, srcset[, avif_srcset]} d'après le manifeste."""
+
+    def srcset(ext):
+        candidates = [
+            f"/{images_dir}/{name}-{w}w{ext} {w}w" for w in entry.get("variants", [])
+        ]
+        candidates.append(f"/{images_dir}/{name}{ext} {entry['width']}w")
+        return ", ".join(candidates)
+
+    image = {
+        "url": f"/{images_dir}/{name}.webp",
+        "width": entry["width"],
+        "height": entry["height"],
+        "srcset": srcset(".webp"),
+    }
+    if "AVIF" in entry.get("qualities", {}):
+        image["avif_srcset"] = srcset(".avif")
+    return image
+
+
+# ═════════════════════════════════════════════════════════
+# ÉTAPE COMPLÈTE
+# ═════════════════════════════════════════════════════════
+def known_image(images_dir, name, manifest):
+    entry = manifest.get(name)
+    if entry and "width" in entry:
+        return describe(images_dir, name, entry)
+    return {"url": f"/{images_dir}/{name}.webp"}
+
+
+def known_images(jobs, images_dir, manifest_path=MANIFEST_PATH):
+    """
+    Comme process_images, sans téléchargement : une image dont le WebP
+    existe est décrite d'après le manifeste, les autres gardent leur URL.
+    """
+    manifest = load_manifest(manifest_path)
+    results = {}
+    for url, name in jobs:
+        if (Path(images_dir) / f"{name}.webp").exists():
+            results[name] = known_image(images_dir, name, manifest)
+        else:
+            results[name] = {"url": url}
+    return results
+
+
+def process_images(jobs, images_dir, quality, manifest_path=MANIFEST_PATH):
+    """
+    `jobs` : liste de (url, nom de fichier sans extension).
+    Retourne {nom: {url, width, height, srcset}}. En cas d'échec, seule
+    l'URL d'origine est conservée ({url}), sauf si un WebP existe déjà
+    pour ce nom (URL Notion expirée d'un arbre de blocs relu depuis le
+    cache).
+    """
+    results = {}
+    if not jobs:
+        return results
+    manifest = load_manifest(manifest_path)
+    output_dir = Path(images_dir)
+    tmp_dir = Path(DOWNLOAD_DIR)
+
+    def known(name):
+        return known_image(images_dir, name, manifest)
+
+    def fetch(job):
+        url, name = job
+        try:
+            return name, download(session, url, tmp_dir / name), None
+        except Exception as e:
+            return name, None, e
+
+    with requests.Session() as session, ThreadPoolExecutor(DOWNLOAD_WORKERS) as pool:
+        downloads = list(pool.map(fetch, jobs))
+
+    urls = {name: url for url, name in jobs}
+    to_encode = []
+    for name, sha, error in downloads:
+        output_path = output_dir / f"{name}.webp"
+        if error is not None:
+            if output_path.exists():
+                print(f"   ♻️  Image déjà présente : {output_path}")
+                results[name] = known(name)
+            else:
+                print(f"   ⚠️  Échec téléchargement image : {error}")
+                results[name] = {"url": urls[name]}
+            continue
+        entry = manifest.get(name, {})
+        if (
+            entry.get("sha256") == sha
+            and entry.get("quality") == quality
+            and entry.get("widths") == list(WIDTHS)
+            and entry.get("mode", "fixed") == ENCODER_MODE
+            and outputs_exist(output_path, entry)
+        ):
+            print(f"   ♻️  Image inchangée : {output_path.name} (sha256 {sha[:12]})")
+            results[name] = describe(images_dir, name, entry)
+            continue
+        to_encode.append((name, sha))
+
+    if to_encode:
+        workers = max(1, min(ENCODE_WORKERS, len(to_encode)))
+        with ProcessPoolExecutor(workers) as pool:
+            futures = {
+                name: (sha, pool.submit(
+                    encode_image, str(tmp_dir / name),
+                    str(output_dir / f"{name}.webp"), quality, WIDTHS, ENCODER_MODE,
+                ))
+                for name, sha in to_encode
+            }
+            for name, (sha, future) in futures.items():
+                try:
+                    encoded = future.result()
+                except Exception as e:
+                    print(f"   ⚠️  Échec conversion image : {e}")
+                    results[name] = {"url": urls[name]}
+                    continue
+                ladder = "/".join(str(w) for w in encoded["variants"]) or "—"
+                formats = ", ".join(
+                    f"{fmt} q{q}" for fmt, q in encoded["qualities"].items()
+                )
+                print(
+                    f"   🖼️  Image : {encoded['width']}x{encoded['height']}px → "
+                    f"{encoded['size'] // 1024}KB ({formats}, variantes {ladder})"
+                )
+                manifest[name] = {
+                    "sha256": sha, "quality": quality, "widths": list(WIDTHS),
+                    "mode": ENCODER_MODE, "qualities": encoded["qualities"],
+                    "width": encoded["width"], "height": encoded["height"],
+                    "variants": encoded["variants"],
+                }
+                results[name] = describe(images_dir, name, manifest[name])
+        save_manifest(manifest, manifest_path)
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    return results
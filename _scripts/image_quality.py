@@ -0,0 +1,120 @@
+"""
+═══════════════════════════════════════════════════════════
+  Recherche de qualité par image — Laura Ballo Coaching
+═══════════════════════════════════════════════════════════
+  Utilisée par image_pipeline.py (mode IMAGE_ENCODER_MODE=search) et
+  par optimize-images.py --search.
+
+  Au lieu d'une qualité fixe, chaque format (WebP, AVIF si Pillow le
+  supporte) est encodé à plusieurs niveaux de QUALITY_LADDER ; on garde
+  le plus petit fichier dont la similarité perceptuelle (SSIM sur la
+  luminance) avec la source reste au-dessus de TARGET_SSIM.
+
+  Le SSIM est calculé en Python pur sur une réduction à SSIM_SIZE px :
+  pas de dépendance en plus de Pillow, quelques dizaines de ms par essai.
+═══════════════════════════════════════════════════════════
+"""
+
+import os
+from io import BytesIO
+
+from PIL import Image, features
+
+# ─────────────────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────────────────
+TARGET_SSIM = float(os.environ.get("IMAGE_TARGET_SSIM") or 0.98)
+QUALITY_LADDER = (40, 50, 60, 70, 80, 90)
+SSIM_SIZE = 256          # plus grand côté de l'image comparée
+SSIM_WINDOW = 8          # fenêtres 8×8 sans recouvrement
+
+AVIF_SUPPORTED = features.check("avif")
+FORMATS = ("WEBP", "AVIF") if AVIF_SUPPORTED else ("WEBP",)
+EXTENSIONS = {"WEBP": ".webp", "AVIF": ".avif"}
+
+_C1 = (0.01 * 255) ** 2
+_C2 = (0.03 * 255) ** 2
+
+
+# ═════════════════════════════════════════════════════════
+# SIMILARITÉ
+# ═════════════════════════════════════════════════════════
+def _luma(img, size):
+    return img.convert("L").resize(size, Image.BILINEAR)
+
+
+def ssim(reference, candidate):
+    """SSIM moyen (0 à 1) entre deux images de même taille, sur la luminance."""
+    w, h = reference.size
+    scale = min(1.0, SSIM_SIZE / max(w, h))
+    size = (max(SSIM_WINDOW, round(w * scale)), max(SSIM_WINDOW, round(h * scale)))
+    a = list(_luma(reference, size).getdata())
+    b = list(_luma(candidate, size).getdata())
+    width, height = size
+    n = SSIM_WINDOW * SSIM_WINDOW
+    scores = []
+    for y0 in range(0, height - SSIM_WINDOW + 1, SSIM_WINDOW):
+        for x0 in range(0, width - SSIM_WINDOW + 1, SSIM_WINDOW):
+            xs, ys = [], []
+            for y in range(y0, y0 + SSIM_WINDOW):
+                row = y * width
+                xs.extend(a[row + x0:row + x0 + SSIM_WINDOW])
+                ys.extend(b[row + x0:row + x0 + SSIM_WINDOW])
+            mx, my = sum(xs) / n, sum(ys) / n
+            vx = sum((v - mx) ** 2 for v in xs) / n
+            vy = sum((v - my) ** 2 for v in ys) / n
+            cov = sum((p - mx) * (q - my) for p, q in zip(xs, ys)) / n
+            scores.append(
+                ((2 * mx * my + _C1) * (2 * cov + _C2))
+                / ((mx * mx + my * my + _C1) * (vx + vy + _C2))
+            )
+    return sum(scores) / len(scores) if scores else 1.0
+
+
+# ═════════════════════════════════════════════════════════
+# ENCODAGE
+# ═════════════════════════════════════════════════════════
+def encode(img, fmt, quality, **options):
+    buffer = BytesIO()
+    img.save(buffer, fmt, quality=quality, **options)
+    return buffer.getvalue()
+
+
+def search(img, fmt, target=TARGET_SSIM, qualities=QUALITY_LADDER, **options):
+    """
+    Plus petite qualité de `qualities` dont le rendu atteint `target`
+    (recherche dichotomique, la similarité croissant avec la qualité).
+    Retourne (qualité, octets encodés, score) ; à défaut, la plus haute.
+    """
+    lo, hi = 0, len(qualities) - 1
+    best = None
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        data = encode(img, fmt, qualities[mid], **options)
+        with Image.open(BytesIO(data)) as decoded:
+            score = ssim(img, decoded)
+        if score >= target:
+            best = (qualities[mid], data, score)
+            hi = mid - 1
+        else:
+            lo = mid + 1
+    if best is None:
+        q = qualities[-1]
+        data = encode(img, fmt, q, **options)
+        with Image.open(BytesIO(data)) as decoded:
+            best = (q, data, ssim(img, decoded))
+    return best
+
+
+def best_encodings(img, formats=FORMATS, target=TARGET_SSIM, options=None):
+    """
+    {format: (qualité, octets, score)} pour chaque format de `formats`.
+    `options` : paramètres d'encodage par format ({"WEBP": {"method": 6}}).
+    L'AVIF n'est gardé que s'il est plus léger que le WebP retenu.
+    """
+    options = options or {}
+    results = {fmt: search(img, fmt, target, **options.get(fmt, {})) for fmt in formats}
+    if "AVIF" in results and "WEBP" in results:
+        if len(results["AVIF"][1]) >= len(results["WEBP"][1]):
+            del results["AVIF"]
+    return results
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+═══════════════════════════════════════════════════════════
+  Intégration des composants au build — Laura Ballo Coaching
+═══════════════════════════════════════════════════════════
+  Remplace dans le HTML les emplacements
+    <div id="header-placeholder"></div>            (et header-formation,
+    <div id="footer-placeholder"></div>             footer, cookies)
+  par le contenu de assets/components/*.html, encadré de marqueurs :
+    <!-- composant:footer --> … <!-- /composant:footer -->
+  Un bloc déjà intégré est remplacé par la version courante du
+  composant : relancer le script propage une modification du footer.
+
+  Plus de fetch() au chargement : header / footer / bannière cookies
+  sont dans la page dès le premier octet (pas d'aller-retour ni de
+  décalage de mise en page). includes.js garde le chargement à la
+  volée pour toute page encore munie d'un emplacement vide.
+
+  Utilisé par publish.py et publish_formations.py sur les pages
+  générées ; en ligne de commande, traite les pages statiques.
+
+  Usage (depuis la racine du dépôt) :
+    python _scripts/inline_components.py
+═══════════════════════════════════════════════════════════
+"""
+
+import os
+import re
+import subprocess
+import time
+from pathlib import Path
+
+# ─────────────────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────────────────
+COMPONENTS_DIR = "assets/components"
+# Même correspondance que COMPONENTS dans assets/js/includes.js
+COMPONENTS = {
+    "header": "header.html",
+    "header-formation": "header-formation.html",
+    "footer": "footer.html",
+    "cookies": "cookies.html",
+}
+# Dossiers jamais traités (en plus des dossiers . et _ comme _templates,
+# où les emplacements doivent rester)
+SKIPPED_DIRS = {COMPONENTS_DIR, "node_modules"}
+
+_names = "|".join(re.escape(n) for n in sorted(COMPONENTS, key=len, reverse=True))
+COMPONENT_RE = re.compile(
+    rf'<div id="(?P<vide>{_names})-placeholder"></div>'
+    rf"|<!-- composant:(?P<bloc>{_names}) -->.*?<!-- /composant:(?P=bloc) -->",
+    re.S,
+)
+
+_cache = {}
+
+
+def load_components(directory=COMPONENTS_DIR):
+    """{nom: bloc balisé}, lu une fois par exécution."""
+    if directory not in _cache:
+        blocs = {}
+        for name, filename in COMPONENTS.items():
+            path = Path(directory) / filename
+            if path.exists():
+                html = path.read_text(encoding="utf-8").strip()
+                blocs[name] = f"<!-- composant:{name} -->\n{html}\n<!-- /composant:{name} -->"
+        _cache[directory] = blocs
+    return _cache[directory]
+
+
+def inline_components(html, components=None):
+    """HTML avec les composants intégrés (emplacements et blocs existants)."""
+    components = components if components is not None else load_components()
+
+    def repl(m):
+        name = m.group("vide") or m.group("bloc")
+        return components.get(name, m.group(0))
+
+    return COMPONENT_RE.sub(repl, html)
+
+
+# ─────────────────────────────────────────────────────────
+# PAGES STATIQUES
+# ─────────────────────────────────────────────────────────
+def walk_pages(directory=""):
+    """Tous les .html du dépôt, hors dossiers cachés / internes."""
+    with os.scandir(directory or ".") as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        if entry.name.startswith((".", "_")):
+            continue
+        rel = f"{directory}/{entry.name}" if directory else entry.name
+        if entry.is_dir(follow_symlinks=False):
+            if rel not in SKIPPED_DIRS:
+                yield from walk_pages(rel)
+        elif entry.name.endswith(".html"):
+            yield rel
+
+
+def inline_static_pages():
+    """Réécrit les pages dont le rendu change ; retourne (pages vues, modifiées)."""
+    components = load_components()
+    vues, modifiees = 0, []
+    for path in walk_pages():
+        vues += 1
+        html = Path(path).read_text(encoding="utf-8")
+        if "-placeholder\"></div>" not in html and "<!-- composant:" not in html:
+            continue
+        nouveau = inline_components(html, components)
+        if nouveau != html:
+            Path(path).write_text(nouveau, encoding="utf-8")
+            modifiees.append(path)
+    return vues, modifiees
+
+
+def git_commit_and_push(paths):
+    try:
+        subprocess.run(["git", "config", "user.name", "Components Bot"], check=True)
+        subprocess.run(["git", "config", "user.email", "bot@lauraballo.com"], check=True)
+        subprocess.run(["git", "add", "--", *paths], check=True)
+        subprocess.run(["git", "commit", "-m", "🧩 Composants intégrés aux pages"], check=True)
+        subprocess.run(["git", "push"], check=True)
+        print("  ✅ Push réussi")
+    except subprocess.CalledProcessError as e:
+        print(f"  ❌ Erreur git : {e}")
+
+
+def main():
+    print("═" * 55)
+    print("  Intégration des composants")
+    print("═" * 55)
+    debut = time.perf_counter()
+    vues, modifiees = inline_static_pages()
+    print(
+        f"🧩 {len(modifiees)} page(s) mise(s) à jour sur {vues} "
+        f"en {(time.perf_counter() - debut) * 1000:.0f} ms"
+    )
+    for path in modifiees:
+        print(f"   {path}")
+    if modifiees:
+        print("\n🚀 Commit & push...")
+        git_commit_and_push(modifiees)
+    print("═" * 55)
+
+
+if __name__ == "__main__":
+    main()
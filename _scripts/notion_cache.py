@@ -0,0 +1,132 @@
+"""
+═══════════════════════════════════════════════════════════
+  Cache disque des réponses Notion — Laura Ballo Coaching
+═══════════════════════════════════════════════════════════
+  Base SQLite sous .cache/notion/ (NOTION_CACHE_DIR), partagée par
+  publish.py et publish_formations.py.
+
+  Une entrée = (type, id, last_edited_time) → JSON. Tant que Notion
+  renvoie le même last_edited_time pour une page, son arbre de blocs
+  est relu depuis le disque au lieu d'être retéléchargé.
+
+    Éviction par âge    : NOTION_CACHE_MAX_AGE_DAYS sans lecture (défaut 30)
+    Éviction par taille : NOTION_CACHE_MAX_MB (défaut 200 Mo), les
+                          entrées les moins récemment lues d'abord
+    Désactivation       : NOTION_CACHE=0
+═══════════════════════════════════════════════════════════
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# ─────────────────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────────────────
+CACHE_DIR = os.environ.get("NOTION_CACHE_DIR") or ".cache/notion"
+CACHE_ENABLED = (os.environ.get("NOTION_CACHE") or "1") != "0"
+MAX_AGE_DAYS = float(os.environ.get("NOTION_CACHE_MAX_AGE_DAYS") or 30)
+MAX_MB = float(os.environ.get("NOTION_CACHE_MAX_MB") or 200)
+
+
+class NotionCache:
+    """Cache (type, id, last_edited_time) → réponse JSON, thread-safe."""
+
+    def __init__(self, directory=CACHE_DIR, enabled=CACHE_ENABLED,
+                 max_age_days=MAX_AGE_DAYS, max_mb=MAX_MB):
+        self.enabled = enabled
+        self.max_age = max_age_days * 86400
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits, self.misses = 0, 0
+        self.lock = threading.Lock()
+        self.db = None
+        if not enabled:
+            return
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(
+            str(Path(directory) / "responses.sqlite3"), check_same_thread=False
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " kind TEXT, id TEXT, edited TEXT, payload TEXT,"
+            " size INTEGER, stored REAL, used REAL,"
+            " PRIMARY KEY (kind, id))"
+        )
+        self.evict()
+
+    @staticmethod
+    def _norm(page_id):
+        return (page_id or "").replace("-", "")
+
+    def get(self, kind, page_id, edited):
+        """Réponse en cache si `edited` correspond, sinon None."""
+        if not self.db or not edited:
+            return None
+        with self.lock:
+            row = self.db.execute(
+                "SELECT payload FROM entries WHERE kind = ? AND id = ? AND edited = ?",
+                (kind, self._norm(page_id), edited),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.db.execute(
+                "UPDATE entries SET used = ? WHERE kind = ? AND id = ?",
+                (time.time(), kind, self._norm(page_id)),
+            )
+            self.db.commit()
+        return json.loads(row[0])
+
+    def put(self, kind, page_id, edited, payload):
+        """Remplace l'entrée (une seule version conservée par id)."""
+        if not self.db or not edited:
+            return
+        data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, self._norm(page_id), edited, data, len(data), now, now),
+            )
+            self.db.commit()
+
+    def evict(self):
+        """Supprime les entrées trop vieilles, puis les moins utilisées au-delà du quota."""
+        if not self.db:
+            return 0
+        with self.lock:
+            cur = self.db.execute(
+                "DELETE FROM entries WHERE used < ?", (time.time() - self.max_age,)
+            )
+            supprimees = cur.rowcount
+            total = self.db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                rows = self.db.execute(
+                    "SELECT kind, id, size FROM entries ORDER BY used"
+                ).fetchall()
+                for kind, page_id, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self.db.execute(
+                        "DELETE FROM entries WHERE kind = ? AND id = ?", (kind, page_id)
+                    )
+                    total -= size
+                    supprimees += 1
+            self.db.commit()
+        return supprimees
+
+    def resume(self):
+        if not self.db:
+            return "💾 Cache Notion désactivé"
+        return f"💾 Cache Notion : {self.hits} lecture(s) disque, {self.misses} absente(s)"
+
+    def close(self):
+        if self.db:
+            self.db.close()
+            self.db = None
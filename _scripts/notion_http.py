@@ -0,0 +1,244 @@
+"""
+═══════════════════════════════════════════════════════════
+  Couche HTTP Notion partagée — Laura Ballo Coaching
+═══════════════════════════════════════════════════════════
+  Utilisée par publish.py et publish_formations.py.
+
+  Une seule requests.Session par exécution : la connexion TLS vers
+  api.notion.com est ouverte une fois puis réutilisée (keep-alive),
+  au lieu d'une poignée de main par appel.
+
+    Pool de connexions  : NOTION_POOL_SIZE (défaut 8), dimensionné
+                          pour les appels concurrents
+    Timeouts par défaut : NOTION_TIMEOUT_CONNECT / NOTION_TIMEOUT_READ
+    Compression         : réponses gzip négociées
+
+  Tous les appels passent par un seau à jetons commun (NOTION_RATE
+  requêtes/s, ~3 chez Notion) : les threads de préchargement attendent
+  leur tour au lieu de déclencher des 429.
+
+    429        → on attend Retry-After, puis on rejoue
+    5xx/réseau → backoff exponentiel avec jitter, NOTION_MAX_RETRIES fois
+
+  NOTION_API (variable d'environnement) remplace l'URL de l'API, par
+  exemple par le serveur local de notion_mock.py.
+
+  En fin de run, resume() indique combien de requêtes ont réutilisé
+  une connexion existante et combien en ont ouvert une nouvelle, le
+  débit obtenu et le temps passé à attendre l'API.
+═══════════════════════════════════════════════════════════
+"""
+
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ─────────────────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────────────────
+# Surchargeable pour viser un serveur local (voir notion_mock.py)
+NOTION_API = os.environ.get("NOTION_API") or "https://api.notion.com/v1"
+NOTION_VERSION = "2022-06-28"
+
+POOL_SIZE = int(os.environ.get("NOTION_POOL_SIZE") or 8)
+TIMEOUT = (
+    float(os.environ.get("NOTION_TIMEOUT_CONNECT") or 5),
+    float(os.environ.get("NOTION_TIMEOUT_READ") or 30),
+)
+
+RATE = float(os.environ.get("NOTION_RATE") or 3)      # requêtes / seconde
+BURST = int(os.environ.get("NOTION_BURST") or 3)      # rafale tolérée
+MAX_RETRIES = int(os.environ.get("NOTION_MAX_RETRIES") or 5)
+BACKOFF_BASE = 0.5                                    # secondes
+BACKOFF_MAX = 30.0
+
+
+# ═════════════════════════════════════════════════════════
+# ORDONNANCEUR : SEAU À JETONS
+# ═════════════════════════════════════════════════════════
+class TokenBucket:
+    """Seau à jetons thread-safe : `rate` jetons/s, au plus `burst` en réserve."""
+
+    def __init__(self, rate=RATE, burst=BURST, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.clock, self.sleep = clock, sleep     # injectables (tests)
+        self.stamp = self.clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """Crédite la recharge depuis le dernier stamp (sous self.lock)."""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def acquire(self):
+        """Bloque jusqu'à obtenir un jeton ; retourne le temps attendu."""
+        attendu = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return attendu
+                delai = (1 - self.tokens) / self.rate
+            self.sleep(delai)
+            attendu += delai
+
+    def pause(self, secondes):
+        """
+        Vide le seau pour `secondes` à partir de maintenant : tous les
+        threads attendent (429). La recharge acquise depuis le dernier stamp
+        est d'abord créditée, puis la dette est plafonnée : des pauses, même
+        décalées dans le temps, ne s'additionnent pas — la fin la plus
+        tardive l'emporte.
+        """
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, -secondes * self.rate)
+
+
+# ═════════════════════════════════════════════════════════
+# SESSION HTTP
+# ═════════════════════════════════════════════════════════
+class NotionHTTP:
+    """Session keep-alive vers l'API Notion, partagée par tous les appels d'un run."""
+
+    def __init__(self, api_key, pool_size=POOL_SIZE, timeout=TIMEOUT,
+                 limiter=None, max_retries=MAX_RETRIES):
+        self.timeout = timeout
+        self.limiter = limiter or TokenBucket()
+        self.max_retries = max_retries
+        self.debut = time.monotonic()
+        self.compteurs = {"appels": 0, "retries": 0, "429": 0, "5xx": 0}
+        self.attente = 0.0
+        self._lock = threading.Lock()
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Notion-Version": NOTION_VERSION,
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+        })
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+    def request(self, method, path, **kwargs):
+        """
+        `path` relatif à NOTION_API (« pages/xxx ») ou URL complète.
+        Retourne la dernière réponse obtenue : après MAX_RETRIES échecs,
+        c'est à l'appelant de traiter le statut (raise_for_status…).
+        """
+        url = path if path.startswith("http") else f"{NOTION_API}/{path}"
+        kwargs.setdefault("timeout", self.timeout)
+        self._compter("appels")
+        tentative = 0
+        while True:
+            self._attendre(self.limiter.acquire())
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if tentative >= self.max_retries:
+                    raise
+                resp = None
+            else:
+                if resp.status_code != 429 and resp.status_code < 500:
+                    return resp
+                if tentative >= self.max_retries:
+                    return resp
+
+            tentative += 1
+            self._compter("retries")
+            if resp is not None and resp.status_code == 429:
+                self._compter("429")
+                delai = retry_after(resp) or backoff(tentative)
+                # La pause est portée par le seau : tous les threads la
+                # respectent, et acquire() la comptabilise au prochain tour.
+                self.limiter.pause(delai)
+                print(f"   ⏳ Notion 429 — pause {delai:.1f}s")
+                continue
+            if resp is not None:
+                self._compter("5xx")
+            delai = backoff(tentative)
+            cause = resp.status_code if resp is not None else "réseau"
+            print(f"   ⏳ Notion {cause} — nouvel essai dans {delai:.1f}s")
+            time.sleep(delai)
+            self._attendre(delai)
+
+    def _compter(self, cle):
+        with self._lock:
+            self.compteurs[cle] += 1
+
+    def _attendre(self, secondes):
+        if secondes:
+            with self._lock:
+                self.attente += secondes
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request("PATCH", path, **kwargs)
+
+    # ─── Statistiques de connexions ──────────────────────
+    def stats(self):
+        """Requêtes envoyées et connexions ouvertes, tous pools confondus."""
+        requetes, ouvertes = 0, 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requetes += pool.num_requests
+            ouvertes += pool.num_connections
+        duree = time.monotonic() - self.debut
+        return {
+            "requetes": requetes,
+            "ouvertes": ouvertes,
+            "reutilisees": max(0, requetes - ouvertes),
+            "duree": duree,
+            "debit": requetes / duree if duree else 0.0,
+            "attente": self.attente,
+            **self.compteurs,
+        }
+
+    def resume(self):
+        s = self.stats()
+        return (
+            f"🔌 HTTP Notion : {s['requetes']} requête(s), "
+            f"{s['reutilisees']} connexion(s) réutilisée(s), "
+            f"{s['ouvertes']} ouverte(s)\n"
+            f"   {s['debit']:.1f} req/s sur {s['duree']:.1f}s, "
+            f"{s['attente']:.1f}s d'attente cumulée (limite + retries), "
+            f"{s['429']} × 429, {s['5xx']} × 5xx, {s['retries']} retry(s)"
+        )
+
+    def close(self):
+        self.session.close()
+
+
+# ─────────────────────────────────────────────────────────
+# DÉLAIS DE REJEU
+# ─────────────────────────────────────────────────────────
+def retry_after(resp):
+    """Valeur de l'en-tête Retry-After en secondes, ou None."""
+    valeur = resp.headers.get("Retry-After", "")
+    try:
+        return max(0.0, float(valeur))
+    except ValueError:
+        return None
+
+
+def backoff(tentative):
+    """Backoff exponentiel avec jitter : tiré entre base/2 et base·2ⁿ (plafonné)."""
+    plafond = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** tentative))
+    return random.uniform(BACKOFF_BASE / 2, plafond)
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+═══════════════════════════════════════════════════════════
+  Serveur Notion local (bouchon) — Laura Ballo Coaching
+═══════════════════════════════════════════════════════════
+  Remplace api.notion.com pour publish.py et publish_formations.py :
+  benchmarks et essais sans identifiants, hors ligne ou en CI.
+
+    POST  /v1/databases/{id}/query     filtre select / status /
+                                       checkbox, and / or ; pagination
+    GET   /v1/blocks/{id}/children     pagination (page_size, start_cursor)
+    GET   /v1/pages/{id}
+    PATCH /v1/pages/{id}               propriétés fusionnées (en mémoire)
+
+  Réponses paginées comme Notion : has_more / next_cursor, au plus
+  --page-size résultats (défaut 100 ; plus petit pour forcer la
+  pagination). --latency / --jitter ajoutent un délai par requête,
+  --rate-429 renvoie une part des requêtes en 429 avec Retry-After.
+
+  Fixtures (NOTION_MOCK_FIXTURES, défaut .cache/notion-fixtures) :
+    databases/<id>.json   liste des pages de la base
+    pages/<id>.json       pages hors bases enregistrées (relations)
+    blocks/<id>.json      enfants d'un bloc ou d'une page
+
+  Usage (depuis la racine du dépôt) :
+    python _scripts/notion_mock.py record <database_id> [<database_id> …]
+        → enregistre les vraies réponses (NOTION_API_KEY, lecture seule)
+    python _scripts/notion_mock.py synth --articles 200
+        → fixtures factices pour publish.py (sans images)
+    python _scripts/notion_mock.py serve --port 8765 --latency 0.3 --rate-429 0.05
+
+    NOTION_API=http://127.0.0.1:8765/v1 NOTION_API_KEY=mock NOTION_RATE=1000 \
+      python _scripts/publish.py
+═══════════════════════════════════════════════════════════
+"""
+
+import argparse
+import json
+import os
+import random
+import signal
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+# ─────────────────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────────────────
+FIXTURES_DIR = os.environ.get("NOTION_MOCK_FIXTURES") or ".cache/notion-fixtures"
+PORT = int(os.environ.get("NOTION_MOCK_PORT") or 8765)
+MAX_PAGE_SIZE = 100           # plafond de l'API Notion
+
+
+def norm(object_id):
+    return (object_id or "").replace("-", "")
+
+
+def now_iso():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+# ═════════════════════════════════════════════════════════
+# DONNÉES
+# ═════════════════════════════════════════════════════════
+class Fixtures:
+    """Bases, pages et enfants de blocs, chargés depuis le disque."""
+
+    def __init__(self, directory=FIXTURES_DIR):
+        self.databases, self.pages, self.blocks = {}, {}, {}
+        self.lock = threading.Lock()
+        root = Path(directory)
+        for path in sorted(root.glob("databases/*.json")):
+            pages = json.loads(path.read_text(encoding="utf-8"))
+            self.databases[norm(path.stem)] = [norm(p["id"]) for p in pages]
+            self.pages.update({norm(p["id"]): p for p in pages})
+        for path in sorted(root.glob("pages/*.json")):
+            self.pages.setdefault(norm(path.stem), json.loads(path.read_text(encoding="utf-8")))
+        for path in sorted(root.glob("blocks/*.json")):
+            self.blocks[norm(path.stem)] = json.loads(path.read_text(encoding="utf-8"))
+
+    def query(self, database_id, filtre):
+        ids = self.databases.get(norm(database_id))
+        if ids is None:
+            return None
+        with self.lock:
+            return [self.pages[i] for i in ids if matches(self.pages[i], filtre)]
+
+    def update_page(self, page_id, properties):
+        with self.lock:
+            page = self.pages.get(norm(page_id))
+            if page is None:
+                return None
+            for name, value in properties.items():
+                prop = page.setdefault("properties", {}).setdefault(name, {})
+                prop.update(value)
+                if "select" in value and "type" not in prop:
+                    prop["type"] = "select"
+            page["last_edited_time"] = now_iso()
+            return page
+
+
+def matches(page, filtre):
+    """Sous-ensemble des filtres Notion utilisés par les scripts du site."""
+    if not filtre:
+        return True
+    if "and" in filtre:
+        return all(matches(page, f) for f in filtre["and"])
+    if "or" in filtre:
+        return any(matches(page, f) for f in filtre["or"])
+    prop = page.get("properties", {}).get(filtre.get("property"), {})
+    for kind in ("select", "status"):
+        if kind in filtre:
+            cond, value = filtre[kind], (prop.get(kind) or {}).get("name")
+            if "equals" in cond:
+                return value == cond["equals"]
+            if "does_not_equal" in cond:
+                return value != cond["does_not_equal"]
+            if "is_empty" in cond:
+                return value is None
+            if "is_not_empty" in cond:
+                return value is not None
+    if "checkbox" in filtre:
+        return prop.get("checkbox", False) == filtre["checkbox"].get("equals")
+    return True   # filtre non géré : rien n'est exclu
+
+
+def paginate(items, start_cursor, page_size):
+    debut = int(start_cursor or 0)
+    fin = debut + page_size
+    return {
+        "object": "list",
+        "results": items[debut:fin],
+        "has_more": fin < len(items),
+        "next_cursor": str(fin) if fin < len(items) else None,
+    }
+
+
+# ═════════════════════════════════════════════════════════
+# SERVEUR
+# ═════════════════════════════════════════════════════════
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = "NotionMock/1"
+    protocol_version = "HTTP/1.1"     # keep-alive, comme l'API réelle
+    disable_nagle_algorithm = True    # en-têtes et corps écrits séparément : pas d'attente d'ACK
+
+    def log_message(self, fmt, *args):
+        if self.server.options.verbose:
+            super().log_message(fmt, *args)
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, code, message):
+        self._send(status, {"object": "error", "status": status, "code": code, "message": message})
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def _handle(self, method):
+        options, fixtures = self.server.options, self.server.fixtures
+        url = urlsplit(self.path)
+        parts = url.path.strip("/").split("/")
+        body = self._body() if method in ("POST", "PATCH") else {}
+        self.server.compter(method)
+
+        if options.latency or options.jitter:
+            time.sleep(options.latency + random.uniform(0, options.jitter))
+        if options.rate_429 and random.random() < options.rate_429:
+            self.server.compter("429")
+            self._send(
+                429, {"object": "error", "status": 429, "code": "rate_limited",
+                      "message": "Rate limited (mock)"},
+                {"Retry-After": f"{options.retry_after:g}"},
+            )
+            return
+
+        if parts[:1] == ["v1"]:
+            parts = parts[1:]
+        page_size = min(MAX_PAGE_SIZE, options.page_size)
+
+        if method == "POST" and len(parts) == 3 and parts[0] == "databases" and parts[2] == "query":
+            results = fixtures.query(parts[1], body.get("filter"))
+            if results is None:
+                return self._error(404, "object_not_found", f"Database {parts[1]} absente des fixtures")
+            size = min(page_size, int(body.get("page_size") or MAX_PAGE_SIZE))
+            return self._send(200, paginate(results, body.get("start_cursor"), size))
+
+        if method == "GET" and len(parts) == 3 and parts[0] == "blocks" and parts[2] == "children":
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            children = fixtures.blocks.get(norm(parts[1]), [])
+            size = min(page_size, int(params.get("page_size") or MAX_PAGE_SIZE))
+            return self._send(200, paginate(children, params.get("start_cursor"), size))
+
+        if len(parts) == 2 and parts[0] == "pages" and method in ("GET", "PATCH"):
+            if method == "GET":
+                page = fixtures.pages.get(norm(parts[1]))
+            else:
+                page = fixtures.update_page(parts[1], body.get("properties", {}))
+            if page is None:
+                return self._error(404, "object_not_found", f"Page {parts[1]} absente des fixtures")
+            return self._send(200, page)
+
+        self._error(400, "invalid_request_url", f"{method} {url.path} non simulé")
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fixtures, options):
+        super().__init__(address, MockHandler)
+        self.fixtures, self.options = fixtures, options
+        self.compteurs = {}
+        self._lock = threading.Lock()
+
+    def compter(self, cle):
+        with self._lock:
+            self.compteurs[cle] = self.compteurs.get(cle, 0) + 1
+
+
+def _interrompre(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(args):
+    fixtures = Fixtures(args.fixtures)
+    server = MockServer(("127.0.0.1", args.port), fixtures, args)
+    print(
+        f"🧪 Notion simulé sur http://127.0.0.1:{args.port}/v1 — "
+        f"{len(fixtures.databases)} base(s), {len(fixtures.pages)} page(s), "
+        f"{len(fixtures.blocks)} liste(s) de blocs"
+    )
+    print(
+        f"   latence {args.latency * 1000:.0f}±{args.jitter * 1000:.0f} ms, "
+        f"429 : {args.rate_429:.0%}, page_size ≤ {args.page_size}"
+    )
+    # SIGTERM (CI, processus en arrière-plan) : même sortie propre que Ctrl-C
+    signal.signal(signal.SIGTERM, _interrompre)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n   requêtes : {server.compteurs}")
+
+
+# ═════════════════════════════════════════════════════════
+# ENREGISTREMENT (API réelle → fixtures)
+# ═════════════════════════════════════════════════════════
+def record(args):
+    """Lecture seule : bases, pages liées (relations) et arbres de blocs complets."""
+    from notion_http import NotionHTTP
+
+    api_key = os.environ.get("NOTION_API_KEY") or ""
+    if not api_key:
+        print("❌ Variable NOTION_API_KEY manquante.")
+        raise SystemExit(1)
+    http = NotionHTTP(api_key)
+    root = Path(args.fixtures)
+    for sub in ("databases", "pages", "blocks"):
+        (root / sub).mkdir(parents=True, exist_ok=True)
+
+    def paged(method, path, **kwargs):
+        results, cursor = [], None
+        while True:
+            if method == "POST":
+                kwargs["json"] = {**kwargs.get("json", {}), **({"start_cursor": cursor} if cursor else {})}
+            else:
+                kwargs["params"] = {"page_size": 100, **({"start_cursor": cursor} if cursor else {})}
+            resp = http.request(method, path, **kwargs)
+            resp.raise_for_status()
+            data = resp.json()
+            results.extend(data.get("results", []))
+            if not data.get("has_more"):
+                return results
+            cursor = data.get("next_cursor")
+
+    def save(sub, object_id, payload):
+        path = root / sub / f"{norm(object_id)}.json"
+        path.write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding="utf-8")
+
+    connues, relations = set(), set()
+    for database_id in args.databases:
+        pages = paged("POST", f"databases/{database_id}/query")
+        save("databases", database_id, pages)
+        print(f"📚 {database_id} : {len(pages)} page(s)")
+        for page in pages:
+            connues.add(norm(page["id"]))
+            for prop in page.get("properties", {}).values():
+                relations.update(norm(r["id"]) for r in prop.get("relation") or [])
+    for page_id in sorted(relations - connues):
+        resp = http.get(f"pages/{page_id}")
+        if resp.ok:
+            save("pages", page_id, resp.json())
+
+    a_lire, nb = sorted(connues), 0
+    while a_lire:
+        block_id = a_lire.pop()
+        children = paged("GET", f"blocks/{block_id}/children")
+        save("blocks", block_id, children)
+        nb += 1
+        a_lire.extend(b["id"] for b in children if b.get("has_children"))
+    print(f"🌳 {nb} liste(s) de blocs, {len(relations - connues)} page(s) liée(s)")
+    print(http.resume())
+
+
+# ═════════════════════════════════════════════════════════
+# FIXTURES FACTICES (publish.py)
+# ═════════════════════════════════════════════════════════
+def rich(text):
+    return [{"type": "text", "plain_text": text, "text": {"content": text}, "annotations": {}}]
+
+
+def block(block_id, kind, text, has_children=False):
+    return {"object": "block", "id": block_id, "type": kind, "has_children": has_children,
+            kind: {"rich_text": rich(text)}}
+
+
+def synth(args):
+    """Base d'articles « Article à publier » aux propriétés attendues par publish.py."""
+    database_id = norm(os.environ.get("NOTION_DATABASE_ID") or "300075e127d2809eaac2e85bba8280ef")
+    tags = ["Leadership", "Communication", "Hypersensibilité", "Prise de parole en public"]
+    lorem = ("Le leadership se construit dans la relation, la clarté et l'écoute ; "
+             "chaque prise de parole est une occasion d'incarner sa posture. ") * 3
+    rng = random.Random(args.seed)
+    root = Path(args.fixtures)
+    for sub in ("databases", "blocks"):
+        (root / sub).mkdir(parents=True, exist_ok=True)
+
+    pages = []
+    for n in range(1, args.articles + 1):
+        page_id = f"{n:08d}-0000-4000-8000-{n:012d}"
+        pages.append({
+            "object": "page", "id": page_id, "last_edited_time": "2026-01-01T00:00:00.000Z",
+            "properties": {
+                "Titre de l'article": {"type": "title", "title": rich(f"Article de test {n}")},
+                "Slug": {"type": "rich_text", "rich_text": rich(f"article-de-test-{n}")},
+                "Méta description": {"type": "rich_text", "rich_text": rich(lorem[:150])},
+                "Tags": {"type": "multi_select", "multi_select": [
+                    {"name": t} for t in rng.sample(tags, 2)]},
+                "Situation": {"type": "multi_select", "multi_select": [{"name": "Leadership"}]},
+                "Action à effectuer": {"type": "select", "select": {"name": "Article à publier"}},
+            },
+        })
+        children = []
+        for s in range(args.sections):
+            base = f"{n:08d}-{s:04d}"
+            liste_id = f"{base}-0000-8000-000000000003"
+            children += [
+                block(f"{base}-0000-8000-000000000001", "heading_2", f"Partie {s + 1}"),
+                block(f"{base}-0000-8000-000000000002", "paragraph", lorem),
+                block(liste_id, "bulleted_list_item", "Point clé", True),
+            ]
+            (root / "blocks" / f"{norm(liste_id)}.json").write_text(json.dumps(
+                [block(f"{base}-0000-8000-000000000004", "bulleted_list_item", "Sous-point")],
+                ensure_ascii=False,
+            ), encoding="utf-8")
+        (root / "blocks" / f"{norm(page_id)}.json").write_text(
+            json.dumps(children, ensure_ascii=False), encoding="utf-8"
+        )
+    (root / "databases" / f"{database_id}.json").write_text(
+        json.dumps(pages, ensure_ascii=False), encoding="utf-8"
+    )
+    print(f"🧪 {args.articles} article(s) factice(s) dans {root} (base {database_id})")
+
+
+# ═════════════════════════════════════════════════════════
+# MAIN
+# ═════════════════════════════════════════════════════════
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serveur Notion local pour benchmarks / essais")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="dossier des fixtures")
+    sub = parser.add_subparsers(dest="commande", required=True)
+
+    p = sub.add_parser("serve", help="servir les fixtures")
+    p.add_argument("--port", type=int, default=PORT)
+    p.add_argument("--latency", type=float, default=0.0, help="délai par requête (s)")
+    p.add_argument("--jitter", type=float, default=0.0, help="délai aléatoire ajouté (s)")
+    p.add_argument("--rate-429", type=float, default=0.0, help="part des requêtes en 429 (0–1)")
+    p.add_argument("--retry-after", type=float, default=1.0, help="Retry-After des 429 (s)")
+    p.add_argument("--page-size", type=int, default=MAX_PAGE_SIZE, help="résultats max par page")
+    p.add_argument("--verbose", action="store_true", help="journal des requêtes")
+    p.set_defaults(func=serve)
+
+    p = sub.add_parser("record", help="enregistrer des bases réelles comme fixtures")
+    p.add_argument("databases", nargs="+", help="identifiants de bases Notion")
+    p.set_defaults(func=record)
+
+    p = sub.add_parser("synth", help="générer des fixtures factices pour publish.py")
+    p.add_argument("--articles", type=int, default=50)
+    p.add_argument("--sections", type=int, default=5, help="sections par article")
+    p.add_argument("--seed", type=int, default=1)
+    p.set_defaults(func=synth)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    args.func(args)
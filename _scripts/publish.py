@@ -4,11 +4,20 @@
   Notion → Site Publisher — Laura Ballo Coaching
   VERSION : téléchargement images SANS redimensionnement
             (conversion WebP uniquement)
+═══════════════════════════════════════════════════════════
+  Usage (depuis la racine du dépôt) :
+    python _scripts/publish.py                       # publication Notion
+    python _scripts/publish.py --rebuild-from-cache  # re-rendu local
+      → tous les articles du manifeste de publication, depuis les
+        arbres de blocs du cache Notion : aucun appel réseau, pas de
+        commit, durée de rendu affichée par article (RENDER_WORKERS)
 ═══════════════════════════════════════════════════════════
 """
  
 import os
 import sys
+import argparse
+import time
 import json
 import re
 import html as html_module
@@ -16,11 +25,20 @@ import math
 import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
-from io import BytesIO
 import unicodedata
- 
-import requests
-from PIL import Image
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+ 
+from articles_listing import save_listing
+from build_assets import MANIFEST_PATH as ASSETS_MANIFEST_PATH, rewrite_asset_urls
+from critical_css import critical_template
+from image_pipeline import known_images, process_images
+from inline_components import COMPONENTS, COMPONENTS_DIR, inline_components
+from notion_cache import NotionCache
+from notion_http import NotionHTTP
+from related_articles import save_related
+from search_index import save_search_index
+from template_engine import compile_template
  
 # ─────────────────────────────────────────────────────────
 # CONFIG
@@ -30,15 +48,27 @@ DATABASE_ID = os.environ.get("NOTION_DATABASE_ID", "300075e127d2809eaac2e85bba82
 TAGS_REF_DATABASE_ID = os.environ.get("NOTION_TAGS_REF_DATABASE_ID", "82e832b39f8b43a0adc0eff93135a961")
  
 ARTICLES_JSON_PATH = os.environ.get("ARTICLES_JSON_PATH", "blog/articles.json")
+# Index inversé pour la recherche du blog (lu par assets/js/blog.js)
+SEARCH_INDEX_PATH = os.environ.get("SEARCH_INDEX_PATH", "blog/search-index.json")
+# Articles recommandés, un fichier par slug (lu par loadRelatedArticles)
+RELATED_DIR = os.environ.get("RELATED_DIR", "blog/related")
+# Listing paginé de /blog/ : manifeste léger + shards versionnés
+LISTING_PATH = os.environ.get("LISTING_PATH", "blog/listing.json")
+LISTING_DIR = os.environ.get("LISTING_DIR", "blog/listing")
+# Publication incrémentale : last_edited_time, hash du HTML et du gabarit par article
+PUBLISH_MANIFEST_PATH = os.environ.get("PUBLISH_MANIFEST_PATH") or ".cache/publish-manifest.json"
 TEMPLATE_PATH = os.environ.get("TEMPLATE_PATH", "_templates/article.html")
 OUTPUT_DIR = os.environ.get("OUTPUT_DIR", "blog/articles")
 IMAGES_DIR = "assets/img/blog"
  
 SITE_URL = "https://lauraballo.com"
-NOTION_API = "https://api.notion.com/v1"
-NOTION_VERSION = "2022-06-28"
  
 WEBP_QUALITY = 85
+# Les images de contenu (.full-image img) occupent toute la largeur de l'écran
+IMAGE_SIZES = "100vw"
+FETCH_WORKERS = int(os.environ.get("NOTION_FETCH_WORKERS") or 4)
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS") or os.cpu_count() or 1)
+TAGS_CACHE_KEY = "referentiel"   # « last_edited_time » fixe : une seule version en cache
  
 # ─────────────────────────────────────────────────────────
 # MAPPING TAGS → SLUGS
@@ -77,14 +107,11 @@ MOIS_FR = {
 # ═════════════════════════════════════════════════════════
 class NotionClient:
     def __init__(self, api_key):
-        self.headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Notion-Version": NOTION_VERSION,
-            "Content-Type": "application/json",
-        }
+        self.http = NotionHTTP(api_key)
+        self.cache = NotionCache()
  
     def query_database(self, database_id, filter_obj=None):
-        url = f"{NOTION_API}/databases/{database_id}/query"
+        path = f"databases/{database_id}/query"
         payload = {}
         if filter_obj:
             payload["filter"] = filter_obj
@@ -94,7 +121,7 @@ class NotionClient:
         while has_more:
             if start_cursor:
                 payload["start_cursor"] = start_cursor
-            resp = requests.post(url, headers=self.headers, json=payload)
+            resp = self.http.post(path, json=payload)
             resp.raise_for_status()
             data = resp.json()
             results.extend(data.get("results", []))
@@ -103,7 +130,7 @@ class NotionClient:
         return results
  
     def get_page_blocks(self, page_id):
-        url = f"{NOTION_API}/blocks/{page_id}/children"
+        path = f"blocks/{page_id}/children"
         blocks = []
         has_more = True
         start_cursor = None
@@ -111,7 +138,7 @@ class NotionClient:
             params = {"page_size": 100}
             if start_cursor:
                 params["start_cursor"] = start_cursor
-            resp = requests.get(url, headers=self.headers, params=params)
+            resp = self.http.get(path, params=params)
             resp.raise_for_status()
             data = resp.json()
             blocks.extend(data.get("results", []))
@@ -120,10 +147,7 @@ class NotionClient:
         return blocks
  
     def update_page(self, page_id, properties):
-        url = f"{NOTION_API}/pages/{page_id}"
-        resp = requests.patch(
-            url, headers=self.headers, json={"properties": properties}
-        )
+        resp = self.http.patch(f"pages/{page_id}", json={"properties": properties})
         resp.raise_for_status()
         return resp.json()
  
@@ -131,25 +155,44 @@ class NotionClient:
 # ═════════════════════════════════════════════════════════
 # GESTION DES IMAGES
 # ═════════════════════════════════════════════════════════
+def resolve_single_image(url, filename):
+    """Une image isolée → {url, width, height, srcset} ; voir render_article_body."""
+    return process_images([(url, filename)], IMAGES_DIR, WEBP_QUALITY)[filename]
+ 
+ 
 def download_and_compress(url, filename):
-    try:
-        resp = requests.get(url, timeout=20)
-        resp.raise_for_status()
-        img = Image.open(BytesIO(resp.content))
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
-        output_dir = Path(IMAGES_DIR)
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_path = output_dir / f"{filename}.webp"
-        img.save(output_path, "WEBP", quality=WEBP_QUALITY)
-        print(f"   🖼️  Image : {img.width}x{img.height}px → {output_path.stat().st_size // 1024}KB")
-        return f"/{IMAGES_DIR}/{filename}.webp"
-    except Exception as e:
-        print(f"   ⚠️  Échec téléchargement image : {e}")
-        return url
+    return resolve_single_image(url, filename)["url"]
  
  
-def get_main_image(page, slug):
+def responsive_attrs(image, sizes=IMAGE_SIZES):
+    """Attributs srcset / sizes / width / height d'une image issue de process_images."""
+    if not image.get("srcset"):
+        return ""
+    return (
+        f' srcset="{image["srcset"]}" sizes="{sizes}"'
+        f' width="{image["width"]}" height="{image["height"]}"'
+    )
+ 
+ 
+def image_markup(image, alt, indent="      ", sizes=IMAGE_SIZES):
+    """<img>, enveloppé dans un <picture> AVIF/WebP si un AVIF a été produit."""
+    img = (
+        f'<img src="{image["url"]}"{responsive_attrs(image, sizes)} '
+        f'alt="{html_module.escape(alt)}" loading="lazy">'
+    )
+    if not image.get("avif_srcset"):
+        return f"{indent}{img}"
+    return (
+        f"{indent}<picture>\n"
+        f'{indent}  <source type="image/avif" srcset="{image["avif_srcset"]}" sizes="{sizes}">\n'
+        f'{indent}  <source type="image/webp" srcset="{image["srcset"]}" sizes="{sizes}">\n'
+        f"{indent}  {img}\n"
+        f"{indent}</picture>"
+    )
+ 
+ 
+def get_main_image(page, slug, resolve_image=resolve_single_image):
+    """Image principale → {url, width, height, srcset}, ou {} si l'article n'en a pas."""
     props = page.get("properties", {})
     files = props.get("Image", {}).get("files", [])
     if files:
@@ -158,11 +201,11 @@ def get_main_image(page, slug):
             url = file_obj["file"]["url"]
         else:
             url = file_obj["external"]["url"]
-        return download_and_compress(url, f"{slug}-main")
+        return resolve_image(url, f"{slug}-main")
     image_url = props.get("Image URL", {}).get("url", "") or ""
     if image_url:
-        return download_and_compress(image_url, f"{slug}-main")
-    return ""
+        return resolve_image(image_url, f"{slug}-main")
+    return {}
  
  
 # ═════════════════════════════════════════════════════════
@@ -200,7 +243,38 @@ def rich_text_to_plain(rich_text_array):
     return "".join(rt.get("plain_text", "") for rt in rich_text_array)
  
  
-def blocks_to_html(blocks, client=None, slug="article", img_counter=None):
+# Seuls ces blocs voient leurs enfants rendus par blocks_to_html :
+# inutile de télécharger les autres sous-arbres.
+CHILDREN_RENDERED = {"paragraph", "bulleted_list_item", "numbered_list_item"}
+ 
+ 
+def fetch_block_tree(client, blocks, workers=FETCH_WORKERS):
+    """
+    Matérialise l'arbre de blocs en mémoire, niveau par niveau.
+    Tous les enfants d'un même niveau sont téléchargés en parallèle
+    (pool borné à `workers`), puis rangés dans block["_children"].
+    """
+    niveau = blocks
+    requetes = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while niveau:
+            parents = [
+                b for b in niveau
+                if b.get("has_children") and b.get("type") in CHILDREN_RENDERED
+            ]
+            if not parents:
+                break
+            enfants = list(pool.map(lambda b: client.get_page_blocks(b["id"]), parents))
+            requetes += len(parents)
+            niveau = []
+            for parent, children in zip(parents, enfants):
+                parent["_children"] = children
+                niveau.extend(children)
+    return requetes
+ 
+ 
+def blocks_to_html(blocks, client=None, slug="article", img_counter=None,
+                   resolve_image=resolve_single_image):
     if img_counter is None:
         img_counter = [0]
     html_parts = []
@@ -208,12 +282,16 @@ def blocks_to_html(blocks, client=None, slug="article", img_counter=None):
     first_p = True
  
     def get_children_html(block):
-        if not block.get("has_children") or not client:
+        if not block.get("has_children"):
             return ""
-        children = client.get_page_blocks(block["id"])
+        children = block.get("_children")
+        if children is None:
+            if not client:
+                return ""
+            children = client.get_page_blocks(block["id"])
         if not children:
             return ""
-        return "\n" + blocks_to_html(children, client, slug, img_counter)
+        return "\n" + blocks_to_html(children, client, slug, img_counter, resolve_image)
  
     while i < len(blocks):
         block = blocks[i]
@@ -307,17 +385,18 @@ def blocks_to_html(blocks, client=None, slug="article", img_counter=None):
             else:
                 alt_text = raw_caption or "illustration"
                 caption_text = raw_caption
+            image = {"url": url}
             if url:
                 img_counter[0] += 1
                 filename = f"{slug}-{img_counter[0]}"
-                url = download_and_compress(url, filename)
+                image = resolve_image(url, filename)
             cap_html = (
                 f'\n      <p class="image-caption">{html_module.escape(caption_text)}</p>'
                 if caption_text else ""
             )
             html_parts.append(
                 f'    <div class="full-image">\n'
-                f'      <img src="{url}" alt="{html_module.escape(alt_text)}" loading="lazy">'
+                f"{image_markup(image, alt_text)}"
                 f"{cap_html}\n    </div>"
             )
             first_p = False
@@ -332,6 +411,36 @@ def blocks_to_html(blocks, client=None, slug="article", img_counter=None):
     return "\n\n".join(html_parts)
  
  
+def render_article_body(page, blocks, client, slug, offline=False):
+    """
+    Rendu en deux passes autour de l'étape images : la première relève
+    les images (URL source, nom de fichier) sans rien télécharger,
+    process_images les traite en parallèle, la seconde produit le HTML
+    avec les chemins définitifs et les srcset. `offline` : images
+    décrites d'après le manifeste, sans téléchargement (re-rendu).
+    Retourne (image principale {url, width, height, srcset}, HTML).
+    """
+    jobs = []
+ 
+    def record(url, filename):
+        jobs.append((url, filename))
+        return {"url": url}
+ 
+    get_main_image(page, slug, record)
+    blocks_to_html(blocks, client, slug, [0], record)
+    if offline:
+        resolved = known_images(jobs, IMAGES_DIR)
+    else:
+        resolved = process_images(jobs, IMAGES_DIR, WEBP_QUALITY)
+ 
+    def resolve(url, filename):
+        return resolved.get(filename, {"url": url})
+ 
+    main_image = get_main_image(page, slug, resolve)
+    content_html = blocks_to_html(blocks, client, slug, [0], resolve)
+    return main_image, content_html
+ 
+ 
 # ═════════════════════════════════════════════════════════
 # UTILITAIRES
 # ═════════════════════════════════════════════════════════
@@ -362,6 +471,8 @@ def load_tags_reference(client):
             print("   ⚠️  Référentiel Tags vide — fallback sur mapping statique")
             return
         TAG_SLUG_MAP = mapping
+        # Gardé pour les re-rendus hors ligne (--rebuild-from-cache)
+        client.cache.put("tags", TAGS_REF_DATABASE_ID, TAGS_CACHE_KEY, mapping)
         print(f"   ✅ Référentiel Tags chargé : {len(mapping)} tags")
     except Exception as e:
         print(f"   ⚠️  Erreur lecture référentiel Tags : {e}")
@@ -407,30 +518,68 @@ def extract_property(page, prop_name, prop_type="rich_text"):
 # ═════════════════════════════════════════════════════════
 # GÉNÉRATION HTML + JSON
 # ═════════════════════════════════════════════════════════
+def build_article_data(page, blocks, client, date=None, offline=False):
+    """Données d'un article à partir de la page Notion et de son arbre de blocs, ou None si vide."""
+    title = extract_property(page, "Titre de l'article", "title")
+    slug = extract_property(page, "Slug", "rich_text") or slugify(title)
+    tags = extract_property(page, "Tags", "multi_select")
+    main_image, content_html = render_article_body(page, blocks, client, slug, offline)
+    if not content_html.strip():
+        return None
+ 
+    date = date or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    data = {
+        "title": title,
+        "title_seo": extract_property(page, "Titre SEO", "rich_text") or f"{title} | Laura Ballo",
+        "meta_description": extract_property(page, "Méta description", "rich_text") or "",
+        "expression_cle": extract_property(page, "Expression clé principale", "rich_text") or "",
+        "slug": slug,
+        "date": date,
+        "date_formatted": format_date_fr(date),
+        "reading_time": f"{estimate_reading_time(content_html)} min",
+        "category": tags[0] if tags else "Leadership",
+        "tags": tags,
+        "tags_slugs": [tag_to_slug(t) for t in tags],
+        "situations": [s.lower() for s in extract_property(page, "Situation", "multi_select")],
+        "image": main_image.get("url", ""),
+        "image_srcset": main_image.get("srcset", ""),
+        "image_width": main_image.get("width"),
+        "image_height": main_image.get("height"),
+        "image_alt": extract_property(page, "Alt", "rich_text") or "",
+        "canonical_url": f"{SITE_URL}/{slug}",
+        "content_html": content_html,
+    }
+    data["schema_org"] = build_schema_org(data)
+    return data
+ 
+ 
 def generate_html(template, data):
-    output = template
-    replacements = {
-        "{{TITLE_SEO}}": data["title_seo"],
-        "{{META_DESCRIPTION}}": html_module.escape(data["meta_description"]),
-        "{{OG_TITLE}}": html_module.escape(data["title"]),
-        "{{OG_DESCRIPTION}}": html_module.escape(data["meta_description"]),
-        "{{OG_IMAGE}}": data["image"],
-        "{{CANONICAL_URL}}": data["canonical_url"],
-        "{{PUBLISHED_DATE}}": data["date"],
-        "{{CATEGORY}}": data["category"],
-        "{{TITLE}}": html_module.escape(data["title"]),
-        "{{EXCERPT}}": html_module.escape(data["meta_description"]),
-        "{{DATE_FORMATTED}}": data["date_formatted"],
-        "{{READING_TIME}}": data["reading_time"],
-        "{{CONTENT}}": data["content_html"],
-        "{{IMAGE_URL}}": data["image"],
-        "{{SLUG}}": data["slug"],
-        "{{SEARCH_KEYWORDS_JS}}": json.dumps(data["tags_slugs"], ensure_ascii=False),
-        "{{SCHEMA_JSON}}": json.dumps(data["schema_org"], ensure_ascii=False, indent=4),
+    values = {
+        "TITLE_SEO": data["title_seo"],
+        "META_DESCRIPTION": html_module.escape(data["meta_description"]),
+        "OG_TITLE": html_module.escape(data["title"]),
+        "OG_DESCRIPTION": html_module.escape(data["meta_description"]),
+        "OG_IMAGE": data["image"],
+        "CANONICAL_URL": data["canonical_url"],
+        "PUBLISHED_DATE": data["date"],
+        "CATEGORY": data["category"],
+        "TITLE": html_module.escape(data["title"]),
+        "EXCERPT": html_module.escape(data["meta_description"]),
+        "DATE_FORMATTED": data["date_formatted"],
+        "READING_TIME": data["reading_time"],
+        "CONTENT": data["content_html"],
+        "IMAGE_URL": data["image"],
+        "SLUG": data["slug"],
+        "SEARCH_KEYWORDS_JS": json.dumps(data["tags_slugs"], ensure_ascii=False),
+        "SCHEMA_JSON": json.dumps(data["schema_org"], ensure_ascii=False, indent=4),
     }
-    for placeholder, value in replacements.items():
-        output = output.replace(placeholder, str(value))
-    return output
+    # CSS critique inliné, feuilles chargées en asynchrone (calculé une fois
+    # par gabarit et mis en cache sur disque)
+    template = critical_template(template)
+    html = compile_template(template, values, "article.html").render(values)
+    # Header / footer / cookies intégrés au build : plus de fetch au chargement,
+    # puis CSS / JS versionnés (cache immutable)
+    return rewrite_asset_urls(inline_components(html))
  
  
 def build_schema_org(data):
@@ -463,6 +612,7 @@ def load_articles_json(path):
  
  
 def save_articles_json(path, articles):
+    """Écrit articles.json et ses dérivés ; retourne les chemins écrits."""
     articles.sort(key=lambda a: a.get("date", ""), reverse=True)
     used_slugs = set()
     for article in articles:
@@ -472,8 +622,14 @@ def save_articles_json(path, articles):
         for label, slug in TAG_SLUG_MAP.items()
         if slug in used_slugs
     ]
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump({"collections": collections, "articles": articles}, f, ensure_ascii=False, indent=2)
+    contenu = json.dumps({"collections": collections, "articles": articles}, ensure_ascii=False, indent=2)
+    filepath = Path(path)
+    if not filepath.exists() or filepath.read_text(encoding="utf-8") != contenu:
+        filepath.write_text(contenu, encoding="utf-8")
+    save_search_index(SEARCH_INDEX_PATH, articles)
+    save_related(RELATED_DIR, articles)
+    save_listing(LISTING_PATH, LISTING_DIR, articles, collections, slugify)
+    return [path, SEARCH_INDEX_PATH, RELATED_DIR, LISTING_PATH, LISTING_DIR]
  
  
 def upsert_article(articles_list, new_entry):
@@ -499,7 +655,7 @@ def build_json_entry(data):
     }
     keywords.extend([w for w in title_words if w not in stopwords and len(w) > 2])
     keywords = list(dict.fromkeys(keywords))
-    return {
+    entry = {
         "id": data["slug"],
         "title": data["title"],
         "slug": data["slug"],
@@ -514,6 +670,126 @@ def build_json_entry(data):
         "image": data["image"],
         "featured": False,
     }
+    if data.get("image_srcset"):
+        entry["imageSrcset"] = data["image_srcset"]
+        entry["imageWidth"] = data["image_width"]
+        entry["imageHeight"] = data["image_height"]
+    return entry
+ 
+ 
+# ═════════════════════════════════════════════════════════
+# PUBLICATION INCRÉMENTALE
+# ═════════════════════════════════════════════════════════
+# Manifeste {slug: {page_id, edited, date, html, template}} : un article
+# dont le last_edited_time, le gabarit et le fichier HTML n'ont pas
+# bougé n'est ni retéléchargé ni re-rendu. Si le gabarit change, les
+# articles sont re-rendus depuis les arbres de blocs du cache Notion.
+def sha256_text(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+ 
+ 
+def template_fingerprint(template):
+    """Hash de tout ce qui entre dans le HTML hors contenu : gabarit, composants, assets."""
+    parts = [template]
+    for filename in COMPONENTS.values():
+        path = Path(COMPONENTS_DIR) / filename
+        parts.append(path.read_text(encoding="utf-8") if path.exists() else "")
+    path = Path(ASSETS_MANIFEST_PATH)
+    parts.append(path.read_text(encoding="utf-8") if path.exists() else "")
+    return sha256_text("\0".join(parts))
+ 
+ 
+def load_publish_manifest(path=PUBLISH_MANIFEST_PATH):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+ 
+ 
+def save_publish_manifest(manifest, path=PUBLISH_MANIFEST_PATH):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+ 
+ 
+def is_unchanged(entry, edited, fingerprint, output_file):
+    return (
+        entry is not None
+        and entry.get("edited") == edited
+        and entry.get("template") == fingerprint
+        and output_file.exists()
+        and sha256_text(output_file.read_text(encoding="utf-8")) == entry.get("html")
+    )
+ 
+ 
+def write_article(html_output, data, page_id, edited, fingerprint, manifest):
+    """Écrit le HTML s'il a changé et met à jour le manifeste ; retourne le chemin ou None."""
+    output_path = Path(OUTPUT_DIR)
+    output_path.mkdir(parents=True, exist_ok=True)
+    output_file = output_path / f"{data['slug']}.html"
+    digest = sha256_text(html_output)
+    manifest[data["slug"]] = {
+        "page_id": page_id, "edited": edited, "date": data["date"],
+        "html": digest, "template": fingerprint,
+    }
+    if output_file.exists() and sha256_text(output_file.read_text(encoding="utf-8")) == digest:
+        return None
+    output_file.write_text(html_output, encoding="utf-8")
+    return str(output_file)
+ 
+ 
+def render_cached(job):
+    """
+    Rendu d'un article dans un processus du pool, sans réseau.
+    `job` = (gabarit, page, blocs, date, référentiel tags) ;
+    retourne (données, HTML, durée en secondes) — (None, None, durée) si vide.
+    """
+    global TAG_SLUG_MAP
+    template, page, blocks, date, tag_map = job
+    TAG_SLUG_MAP = tag_map
+    debut = time.perf_counter()
+    data = build_article_data(page, blocks, None, date=date, offline=True)
+    html_output = generate_html(template, data) if data else None
+    return data, html_output, time.perf_counter() - debut
+ 
+ 
+def rerender_from_cache(cache, template, fingerprint, manifest, articles_list, slugs=None):
+    """
+    Re-rend, sans appel Notion, les articles `slugs` du manifeste (par
+    défaut ceux rendus avec un autre gabarit), en parallèle dans un pool
+    de processus. Retourne (fichiers modifiés, articles_list).
+    """
+    if slugs is None:
+        slugs = [slug for slug, entry in manifest.items() if entry.get("template") != fingerprint]
+        if slugs:
+            print(f"\n🔁 Gabarit modifié — {len(slugs)} article(s) à re-rendre depuis le cache")
+    tag_map = cache.get("tags", TAGS_REF_DATABASE_ID, TAGS_CACHE_KEY) or TAG_SLUG_MAP
+ 
+    jobs = {}
+    for slug in sorted(slugs):
+        entry = manifest[slug]
+        page = cache.get("page", entry["page_id"], entry["edited"])
+        blocks = cache.get("blocks", entry["page_id"], entry["edited"])
+        if page is None or blocks is None:
+            print(f"   ⚠️  {slug} : absent du cache Notion — à republier depuis Notion")
+            continue
+        jobs[slug] = (template, page, blocks, entry["date"], tag_map)
+ 
+    modified = []
+    if not jobs:
+        return modified, articles_list
+    workers = max(1, min(RENDER_WORKERS, len(jobs)))
+    with ProcessPoolExecutor(workers) as pool:
+        for slug, (data, html_output, duree) in zip(jobs, pool.map(render_cached, jobs.values())):
+            if data is None:
+                print(f"   ⚠️  {slug} : contenu vide — ignoré")
+                continue
+            entry = manifest[slug]
+            path = write_article(html_output, data, entry["page_id"], entry["edited"], fingerprint, manifest)
+            if path:
+                modified.append(path)
+            articles_list = upsert_article(articles_list, build_json_entry(data))
+            print(f"   ✅ {slug} — {duree * 1000:.0f} ms{'' if path else ' (HTML identique)'}")
+    return modified, articles_list
  
  
 # ═════════════════════════════════════════════════════════
@@ -528,8 +804,9 @@ def git_commit_and_push(files, message):
         subprocess.run(["git", "add", IMAGES_DIR], check=True)
         result = subprocess.run(["git", "status", "--porcelain"], capture_output=True, text=True)
         if not result.stdout.strip():
+            # Site déjà à jour (articles inchangés) : Notion peut être mis à jour
             print("  ℹ️  Aucun changement à committer.")
-            return False
+            return True
         subprocess.run(["git", "commit", "-m", message], check=True)
         subprocess.run(["git", "push"], check=True)
         print(f"  ✅ Push réussi : {message}")
@@ -562,6 +839,11 @@ def main():
         sys.exit(1)
     template = template_path.read_text(encoding="utf-8")
     print(f"✅ Template : {TEMPLATE_PATH}")
+    fingerprint = template_fingerprint(template)
+    publish_manifest = load_publish_manifest()
+    stale = [s for s, e in publish_manifest.items() if e.get("template") != fingerprint]
+    if stale:
+        print(f"   ↳ gabarit modifié depuis le rendu de {len(stale)} article(s)")
  
     articles_list = load_articles_json(ARTICLES_JSON_PATH)
     print(f"✅ {ARTICLES_JSON_PATH} : {len(articles_list)} articles existants")
@@ -580,8 +862,9 @@ def main():
     )
     print(f"   → {len(pages_to_delete)} article(s) à supprimer\n")
  
-    if not pages and not pages_to_delete:
+    if not pages and not pages_to_delete and not stale:
         print("ℹ️  Rien à faire. Fin.")
+        print(client.http.resume())
         return
  
     modified_files = []
@@ -608,6 +891,7 @@ def main():
         articles_list = [a for a in articles_list if a.get("slug") != slug]
         if len(articles_list) < before_count:
             print(f"   ✅ Retiré de articles.json")
+        publish_manifest.pop(slug, None)
  
         deleted_page_ids.append((page_id, title))
  
@@ -615,60 +899,44 @@ def main():
     for page in pages:
         page_id = page["id"]
         title = extract_property(page, "Titre de l'article", "title")
-        title_seo = extract_property(page, "Titre SEO", "rich_text") or f"{title} | Laura Ballo"
-        meta_desc = extract_property(page, "Méta description", "rich_text") or ""
-        expression_cle = extract_property(page, "Expression clé principale", "rich_text") or ""
         slug = extract_property(page, "Slug", "rich_text") or slugify(title)
-        image_alt = extract_property(page, "Alt", "rich_text") or ""
-        tags = extract_property(page, "Tags", "multi_select")
-        situations = extract_property(page, "Situation", "multi_select")
  
         print(f"📝 {title}")
         print(f"   slug → {slug}")
  
-        image_url = get_main_image(page, slug)
+        edited = page.get("last_edited_time")
+        output_file = Path(OUTPUT_DIR) / f"{slug}.html"
+        if is_unchanged(publish_manifest.get(slug), edited, fingerprint, output_file):
+            print(f"   ⏭️  Inchangé depuis la dernière publication — ignoré")
+            published_page_ids.append((page_id, title))
+            continue
  
-        blocks = client.get_page_blocks(page_id)
-        img_counter = [0]
-        content_html = blocks_to_html(blocks, client, slug, img_counter)
+        blocks = client.cache.get("blocks", page_id, edited)
+        if blocks is None:
+            blocks = client.get_page_blocks(page_id)
+            nb_sous_arbres = fetch_block_tree(client, blocks)
+            if nb_sous_arbres:
+                print(f"   🌳 {nb_sous_arbres} sous-bloc(s) préchargé(s)")
+            client.cache.put("blocks", page_id, edited, blocks)
+        else:
+            print(f"   💾 Blocs inchangés — lus depuis le cache")
+        # La page elle-même, pour re-rendre l'article sans Notion (gabarit modifié)
+        client.cache.put("page", page_id, edited, page)
+        article_data = build_article_data(page, blocks, client)
  
-        if not content_html.strip():
+        if article_data is None:
             print(f"   ⚠️  Contenu vide — ignoré")
             continue
  
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        reading_time = f"{estimate_reading_time(content_html)} min"
-        category = tags[0] if tags else "Leadership"
-        tags_slugs = [tag_to_slug(t) for t in tags]
-        situations_lower = [s.lower() for s in situations]
- 
-        article_data = {
-            "title": title,
-            "title_seo": title_seo,
-            "meta_description": meta_desc,
-            "expression_cle": expression_cle,
-            "slug": slug,
-            "date": today,
-            "date_formatted": format_date_fr(today),
-            "reading_time": reading_time,
-            "category": category,
-            "tags": tags,
-            "tags_slugs": tags_slugs,
-            "situations": situations_lower,
-            "image": image_url,
-            "image_alt": image_alt,
-            "canonical_url": f"{SITE_URL}/{slug}",
-            "content_html": content_html,
-        }
-        article_data["schema_org"] = build_schema_org(article_data)
- 
-        output_path = Path(OUTPUT_DIR)
-        output_path.mkdir(parents=True, exist_ok=True)
-        output_file = output_path / f"{slug}.html"
-        html_output = generate_html(template, article_data)
-        output_file.write_text(html_output, encoding="utf-8")
-        modified_files.append(str(output_file))
-        print(f"   ✅ HTML généré")
+        written = write_article(
+            generate_html(template, article_data), article_data,
+            page_id, edited, fingerprint, publish_manifest,
+        )
+        if written:
+            modified_files.append(written)
+            print(f"   ✅ HTML généré")
+        else:
+            print(f"   ✅ HTML identique — fichier conservé")
  
         json_entry = build_json_entry(article_data)
         articles_list = upsert_article(articles_list, json_entry)
@@ -676,8 +944,14 @@ def main():
  
         published_page_ids.append((page_id, title))
  
-    save_articles_json(ARTICLES_JSON_PATH, articles_list)
-    modified_files.append(ARTICLES_JSON_PATH)
+    # ── RE-RENDU (gabarit modifié) ──
+    rerendered, articles_list = rerender_from_cache(
+        client.cache, template, fingerprint, publish_manifest, articles_list
+    )
+    modified_files.extend(rerendered)
+    save_publish_manifest(publish_manifest)
+ 
+    modified_files.extend(save_articles_json(ARTICLES_JSON_PATH, articles_list))
     print(f"\n💾 {ARTICLES_JSON_PATH} ({len(articles_list)} articles)")
  
     parts = []
@@ -685,6 +959,8 @@ def main():
         parts.append(f"📝 Publié : {', '.join(t for _, t in published_page_ids)}")
     if deleted_page_ids:
         parts.append(f"🗑️ Supprimé : {', '.join(t for _, t in deleted_page_ids)}")
+    if rerendered:
+        parts.append(f"🔁 Re-rendu : {len(rerendered)} article(s)")
     commit_msg = " | ".join(parts)
     if len(commit_msg) > 100:
         commit_msg = f"📝 {len(published_page_ids)} publié(s), 🗑️ {len(deleted_page_ids)} supprimé(s)"
@@ -713,12 +989,66 @@ def main():
             except Exception as e:
                 print(f"   ⚠️  {title}: {e}")
  
+    print(f"\n{client.http.resume()}")
+    print(client.cache.resume())
     print("\n" + "═" * 55)
     print(f"  ✅ Terminé — {len(published_page_ids)} publié(s), {len(deleted_page_ids)} supprimé(s)")
     print("═" * 55)
  
  
+def rebuild_from_cache():
+    print("═" * 55)
+    print("  Re-rendu des articles depuis le cache (hors ligne)")
+    print("═" * 55)
+ 
+    template_path = Path(TEMPLATE_PATH)
+    if not template_path.exists():
+        print(f"❌ Template introuvable : {TEMPLATE_PATH}")
+        sys.exit(1)
+    template = template_path.read_text(encoding="utf-8")
+    manifest = load_publish_manifest()
+    if not manifest:
+        print(f"ℹ️  {PUBLISH_MANIFEST_PATH} vide — publier au moins une fois depuis Notion.")
+        return
+ 
+    orphelins = sorted(
+        p.stem for p in Path(OUTPUT_DIR).glob("*.html") if p.stem not in manifest
+    )
+    if orphelins:
+        print(f"⚠️  {len(orphelins)} article(s) sans arbre de blocs en cache (republier depuis Notion) :")
+        for slug in orphelins:
+            print(f"   {slug}")
+ 
+    cache = NotionCache()
+    articles_list = load_articles_json(ARTICLES_JSON_PATH)
+    print(f"\n🔁 {len(manifest)} article(s), {min(RENDER_WORKERS, len(manifest))} processus")
+    debut = time.perf_counter()
+    modified, articles_list = rerender_from_cache(
+        cache, template, template_fingerprint(template), manifest, articles_list, slugs=list(manifest)
+    )
+    save_publish_manifest(manifest)
+    save_articles_json(ARTICLES_JSON_PATH, articles_list)
+ 
+    print(f"\n{cache.resume()}")
+    cache.close()
+    print("\n" + "═" * 55)
+    print(f"  ✅ {len(modified)} fichier(s) modifié(s) en {time.perf_counter() - debut:.1f} s")
+    print("═" * 55)
+ 
+ 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Publication des articles Notion")
+    parser.add_argument(
+        "--rebuild-from-cache", action="store_true",
+        help="re-rendre tous les articles depuis le cache local, sans appel Notion",
+    )
+    return parser.parse_args()
+ 
+ 
 if __name__ == "__main__":
-    main()
+    if parse_args().rebuild_from_cache:
+        rebuild_from_cache()
+    else:
+        main()
  
 
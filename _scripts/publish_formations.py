@@ -11,7 +11,11 @@
     Publié / Non publié    → aucune action
 
   Les avis proviennent de « 😊 Satisfaction », en remontant la chaîne
-  Satisfaction → Participant → Sessions → Formation.
+  Satisfaction → Participant → Sessions → Formation. Les bases
+  Participants et Sessions sont lues en bloc (une requête paginée
+  chacune) puis jointes en mémoire ; leurs ids se déduisent d'une
+  page liée si NOTION_PARTICIPANTS_DB_ID / NOTION_SESSIONS_DB_ID
+  ne sont pas fournis.
 
     Note affichée   : moyenne des « Note publique /5 » de TOUS les avis
                       de la formation, consentement ou non.
@@ -29,6 +33,8 @@
 import os
 import re
 import json
+import hashlib
+import functools
 import html as html_module
 import subprocess
 from datetime import datetime, timezone
@@ -36,6 +42,12 @@ from pathlib import Path
 
 import requests
 
+from build_assets import rewrite_asset_urls
+from inline_components import inline_components
+from notion_cache import NotionCache
+from notion_http import NotionHTTP
+from template_engine import compile_template
+
 # ─────────────────────────────────────────────────────────
 # CONFIG
 # ─────────────────────────────────────────────────────────
@@ -48,17 +60,20 @@ def env(nom, defaut=""):
 NOTION_API_KEY = env("NOTION_API_KEY")
 FORMATIONS_DB = env("NOTION_FORMATIONS_DB_ID", "2fd075e127d2817c9efdf1339b79a765")
 SATISFACTION_DB = env("NOTION_SATISFACTION_DB_ID", "2fd075e127d28173b179cfb3a4c0fc95")
+PARTICIPANTS_DB = env("NOTION_PARTICIPANTS_DB_ID")
+SESSIONS_DB = env("NOTION_SESSIONS_DB_ID")
 
 TEMPLATE_PATH = env("FORMATION_TEMPLATE_PATH", "_templates/formation.html")
 INDEX_TEMPLATE_PATH = env(
     "FORMATIONS_INDEX_TEMPLATE_PATH", "_templates/formations-index.html"
 )
 OUTPUT_DIR = env("FORMATIONS_OUTPUT_DIR", "formations")
+INDEX_MANIFEST_PATH = env(
+    "FORMATIONS_INDEX_MANIFEST_PATH", ".cache/formations-index.json"
+)
 IMAGES_DIR = "assets/img/formations"
 
 SITE_URL = "https://lauraballo.com"
-NOTION_API = "https://api.notion.com/v1"
-NOTION_VERSION = "2022-06-28"
 
 STATUT_PROP = "Statut publication"
 A_PUBLIER, A_MODIFIER, A_SUPPRIMER = "À publier", "À modifier", "À supprimer"
@@ -77,11 +92,8 @@ SEC_EVALUATION = "évaluation"
 # ═════════════════════════════════════════════════════════
 class NotionClient:
     def __init__(self, api_key):
-        self.headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Notion-Version": NOTION_VERSION,
-            "Content-Type": "application/json",
-        }
+        self.http = NotionHTTP(api_key)
+        self.cache = NotionCache()
         self._page_cache = {}
 
     def _diagnostic(self, resp, quoi, identifiant):
@@ -102,10 +114,16 @@ class NotionClient:
                 "   Les bases nécessaires : 📚 Formations, 😊 Satisfaction, "
                 "👥 Participants et 📅 Sessions."
             )
+        if resp.status_code == 429:
+            raise SystemExit(
+                "\n❌ Notion limite toujours le débit (429) après "
+                f"{self.http.max_retries} nouvelles tentatives.\n"
+                "   → Relance le workflow plus tard, ou baisse NOTION_RATE."
+            )
         resp.raise_for_status()
 
     def query_database(self, database_id, filter_obj=None):
-        url = f"{NOTION_API}/databases/{database_id}/query"
+        path = f"databases/{database_id}/query"
         payload, results = {}, []
         has_more, cursor = True, None
         if filter_obj:
@@ -113,7 +131,7 @@ class NotionClient:
         while has_more:
             if cursor:
                 payload["start_cursor"] = cursor
-            r = requests.post(url, headers=self.headers, json=payload)
+            r = self.http.post(path, json=payload)
             if not r.ok:
                 self._diagnostic(r, "la base de données", database_id)
             d = r.json()
@@ -125,33 +143,43 @@ class NotionClient:
         """Fetch d'une page, avec cache — on remonte beaucoup de relations."""
         if page_id in self._page_cache:
             return self._page_cache[page_id]
-        r = requests.get(f"{NOTION_API}/pages/{page_id}", headers=self.headers)
+        r = self.http.get(f"pages/{page_id}")
         if not r.ok:
             self._diagnostic(r, "la page", page_id)
         page = r.json()
         self._page_cache[page_id] = page
         return page
 
+    def prime_cache(self, pages):
+        """Alimente le cache de get_page avec des pages déjà lues en bloc."""
+        for page in pages:
+            self._page_cache[page["id"]] = page
+
     def get_blocks(self, block_id):
-        url = f"{NOTION_API}/blocks/{block_id}/children"
+        path = f"blocks/{block_id}/children"
         blocks, has_more, cursor = [], True, None
         while has_more:
             params = {"page_size": 100}
             if cursor:
                 params["start_cursor"] = cursor
-            r = requests.get(url, headers=self.headers, params=params)
+            r = self.http.get(path, params=params)
             r.raise_for_status()
             d = r.json()
             blocks.extend(d.get("results", []))
             has_more, cursor = d.get("has_more", False), d.get("next_cursor")
         return blocks
 
+    def get_page_content(self, page):
+        """Blocs de la page, relus depuis le cache disque si elle n'a pas bougé."""
+        edited = page.get("last_edited_time")
+        blocks = self.cache.get("blocks", page["id"], edited)
+        if blocks is None:
+            blocks = self.get_blocks(page["id"])
+            self.cache.put("blocks", page["id"], edited, blocks)
+        return blocks
+
     def update_page(self, page_id, properties):
-        r = requests.patch(
-            f"{NOTION_API}/pages/{page_id}",
-            headers=self.headers,
-            json={"properties": properties},
-        )
+        r = self.http.patch(f"pages/{page_id}", json={"properties": properties})
         r.raise_for_status()
         return r.json()
 
@@ -389,12 +417,47 @@ def render_liste_simple(texte, wrapper):
 # ═════════════════════════════════════════════════════════
 # AVIS : Satisfaction → Participant → Sessions → Formation
 # ═════════════════════════════════════════════════════════
+def indexer_base(client, database_id, ids, quoi):
+    """
+    Lit toute la base liée en une requête paginée et alimente le cache de
+    pages : les get_page() qui suivent deviennent des lectures de dict.
+    Sans id configuré, la base est celle de la première page liée.
+    """
+    manquants = sorted(i for i in ids if i not in client._page_cache)
+    if not manquants:
+        return
+    if not database_id:
+        try:
+            parent = client.get_page(manquants[0]).get("parent", {})
+        except requests.HTTPError:
+            return
+        database_id = parent.get("database_id", "")
+        if not database_id:
+            return
+    pages = client.query_database(database_id)
+    client.prime_cache(pages)
+    print(f"  {len(pages)} page(s) {quoi} indexée(s) en mémoire")
+
+
 def collect_avis(client):
     """Retourne {formation_page_id: [avis, ...]}."""
     par_formation = {}
     entrees = client.query_database(SATISFACTION_DB)
     print(f"  {len(entrees)} entrée(s) de satisfaction")
 
+    # Lecture en bloc des deux maillons intermédiaires de la chaîne
+    participant_ids = {
+        pid for e in entrees for pid in prop(e, "Participant", "relation")
+    }
+    indexer_base(client, PARTICIPANTS_DB, participant_ids, "Participants")
+    session_ids = {
+        sid
+        for pid in participant_ids
+        if pid in client._page_cache
+        for sid in prop(client._page_cache[pid], "📅 Sessions", "relation")
+    }
+    indexer_base(client, SESSIONS_DB, session_ids, "Sessions")
+
     for e in entrees:
         note = prop(e, "Note publique /5", "formula")
         if note is None:
@@ -568,22 +631,19 @@ BLOC_AVIS_SECTION = re.compile(
 )
 
 
+@functools.lru_cache(maxsize=4)
+def sans_avis(template):
+    """Gabarit sans le bloc note du hero ni la section avis (calculé une fois)."""
+    return BLOC_AVIS_SECTION.sub("", BLOC_AVIS_HERO.sub("", template))
+
+
 def render(template, data, avis):
-    out = template
     if not avis or avis["nb_publiables"] == 0:
         # Pas d'avis publiable : on retire le bloc note du hero et la section avis
-        out = BLOC_AVIS_HERO.sub("", out)
-        out = BLOC_AVIS_SECTION.sub("", out)
-    for key, value in data.items():
-        if key.startswith("_"):
-            continue
-        out = out.replace("{{" + key + "}}", str(value if value is not None else ""))
-    restants = re.findall(r"\{\{[A-Z_]+\}\}", out)
-    if restants:
-        print(f"    ⚠️  slots non remplis : {', '.join(sorted(set(restants)))}")
-        for r in set(restants):
-            out = out.replace(r, "")
-    return out
+        template = sans_avis(template)
+    values = {k: v for k, v in data.items() if not k.startswith("_")}
+    html = compile_template(template, values, "formation.html").render(values)
+    return rewrite_asset_urls(inline_components(html))
 
 
 def build_data(client, page, avis):
@@ -595,7 +655,7 @@ def build_data(client, page, avis):
     else:
         duree = f"{int(jours or 1)} jour ({int(heures or 0)} heures)"
 
-    sections = split_sections(client.get_blocks(page["id"]))
+    sections = split_sections(client.get_page_content(page))
     evaluation = render_evaluation(find_section(sections, SEC_EVALUATION))
 
     presentation = render_presentation(find_section(sections, SEC_APPROCHE))
@@ -814,8 +874,33 @@ def build_index_schema(pages):
     )
 
 
+def sha256(texte):
+    return hashlib.sha256(texte.encode("utf-8")).hexdigest()
+
+
+def charger_manifeste(chemin):
+    try:
+        return json.loads(Path(chemin).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def enregistrer_manifeste(chemin, manifeste):
+    Path(chemin).parent.mkdir(parents=True, exist_ok=True)
+    Path(chemin).write_text(
+        json.dumps(manifeste, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+
+
 def regenerer_index(client):
-    """Reconstruit formations/index.html avec TOUTES les formations en statut Publié."""
+    """
+    Reconstruit formations/index.html avec TOUTES les formations en statut Publié.
+
+    Le manifeste (INDEX_MANIFEST_PATH) mémorise, par formation, son
+    last_edited_time et le hash de sa carte, ainsi que le hash du gabarit
+    et du fichier produit. Si rien n'a bougé, ni le gabarit ni le fichier
+    ne sont retouchés et la fonction retourne None ; sinon, le chemin écrit.
+    """
     publiees = client.query_database(
         FORMATIONS_DB,
         {"property": STATUT_PROP, "select": {"equals": PUBLIE}},
@@ -824,15 +909,61 @@ def regenerer_index(client):
     publiees.sort(key=lambda p: prop(p, "Code formation"))
 
     template = Path(INDEX_TEMPLATE_PATH).read_text(encoding="utf-8")
-    html = (
-        template.replace("{{CARDS_HTML}}", "\n\n".join(render_carte(p) for p in publiees))
-        .replace("{{NB_FORMATIONS}}", str(len(publiees)))
-        .replace("{{CHATBOT_FORMATIONS_JS}}", render_chatbot_js(publiees))
-        .replace("{{SCHEMA_JSON}}", build_index_schema(publiees))
-    )
     cible = Path(OUTPUT_DIR) / "index.html"
-    cible.write_text(html, encoding="utf-8")
-    print(f"  ✓ {cible} — {len(publiees)} formation(s) au catalogue")
+    manifeste = charger_manifeste(INDEX_MANIFEST_PATH)
+    anciennes = manifeste.get("formations", {})
+
+    # L'image dépend aussi du dépôt (fichier présent ou non), pas que de Notion
+    etat = [
+        {"id": p["id"], "edited": p.get("last_edited_time", ""), "image": image_url(p)}
+        for p in publiees
+    ]
+    inchange = (
+        cible.exists()
+        and manifeste.get("template") == sha256(template)
+        and manifeste.get("sortie") == sha256(cible.read_text(encoding="utf-8"))
+        and [
+            {"id": i, "edited": f["edited"], "image": f["image"]}
+            for i, f in anciennes.items()
+        ] == etat
+    )
+    if inchange:
+        print(f"  · {cible} à jour — {len(publiees)} formation(s), rien à régénérer")
+        return None
+
+    cartes = [render_carte(p) for p in publiees]
+    values = {
+        "CARDS_HTML": "\n\n".join(cartes),
+        "NB_FORMATIONS": len(publiees),
+        "CHATBOT_FORMATIONS_JS": render_chatbot_js(publiees),
+        "SCHEMA_JSON": build_index_schema(publiees),
+    }
+    html = rewrite_asset_urls(inline_components(
+        compile_template(template, values, "formations-index.html").render(values)
+    ))
+    formations = {
+        e["id"]: {"edited": e["edited"], "image": e["image"], "card": sha256(carte)}
+        for e, carte in zip(etat, cartes)
+    }
+    modifiees = sum(
+        1 for i, f in formations.items()
+        if anciennes.get(i, {}).get("card") != f["card"]
+    ) + len(set(anciennes) - set(formations))
+
+    change = not cible.exists() or cible.read_text(encoding="utf-8") != html
+    if change:
+        cible.write_text(html, encoding="utf-8")
+    enregistrer_manifeste(
+        INDEX_MANIFEST_PATH,
+        {"template": sha256(template), "sortie": sha256(html), "formations": formations},
+    )
+    if not change:
+        print(f"  · {cible} identique — {len(publiees)} formation(s), fichier non réécrit")
+        return None
+    print(
+        f"  ✓ {cible} — {len(publiees)} formation(s) au catalogue, "
+        f"{modifiees} carte(s) modifiée(s)"
+    )
     return str(cible)
 
 
@@ -901,7 +1032,10 @@ def main():
         print("  Aucune formation en attente.")
         print("→ Régénération du catalogue")
         cible = regenerer_index(client)
-        git_commit([cible], "📚 Catalogue formations régénéré")
+        if cible:
+            git_commit([cible], "📚 Catalogue formations régénéré")
+        print(client.http.resume())
+        print(client.cache.resume())
         return
 
     print(f"  {len(a_traiter)} formation(s) en attente")
@@ -954,13 +1088,17 @@ def main():
         client.update_page(page["id"], {STATUT_PROP: {"select": {"name": PUBLIE}}})
 
     print("→ Régénération du catalogue")
-    touches.append(regenerer_index(client))
+    index = regenerer_index(client)
+    if index:
+        touches.append(index)
 
     horodatage = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M")
     git_commit(
         touches,
         f"📚 Formations : {publiees} publiée(s), {supprimees} supprimée(s) — {horodatage}",
     )
+    print(client.http.resume())
+    print(client.cache.resume())
     print("\n✓ Terminé. Lancer generate_sitemap.py pour mettre à jour le sitemap.")
 
 
@@ -0,0 +1,73 @@
+"""
+═══════════════════════════════════════════════════════════
+  Articles recommandés précalculés — Laura Ballo Coaching
+═══════════════════════════════════════════════════════════
+  Utilisé par publish.py (save_articles_json) ; lu par
+  assets/js/blog.js (loadRelatedArticles).
+
+  Pour chaque article, les RELATED_COUNT articles les plus proches
+  sont calculés à la publication et écrits dans un petit fichier :
+
+    blog/related/<slug>.json   → [{title, url, image, tags, …}, …]
+
+  Une page d'article ne télécharge plus tout articles.json pour
+  scorer le catalogue à chaque visite : un seul fichier de ~1KB.
+
+  Score = chevauchement pondéré : tags ×3, situations ×2,
+  mots-clés de recherche ×1 ; à score égal, le plus récent d'abord.
+═══════════════════════════════════════════════════════════
+"""
+
+import json
+from pathlib import Path
+
+# ─────────────────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────────────────
+RELATED_COUNT = 3
+WEIGHTS = {"tags": 3, "situations": 2, "searchKeywords": 1}
+# Champs utiles à renderRelatedArticles (blog.js)
+CARD_FIELDS = (
+    "slug", "title", "url", "image", "imageSrcset", "imageWidth", "imageHeight",
+    "tags", "excerpt", "readingTime",
+)
+
+
+def score(a, b):
+    return sum(
+        weight * len(set(a.get(field) or []) & set(b.get(field) or []))
+        for field, weight in WEIGHTS.items()
+    )
+
+
+def related_graph(articles, count=RELATED_COUNT):
+    """{slug: [slugs recommandés]} — au plus `count` par article, score > 0."""
+    graph = {}
+    for article in articles:
+        candidats = [
+            (score(article, other), other.get("date", ""), other["slug"])
+            for other in articles
+            if other["slug"] != article["slug"]
+        ]
+        candidats = sorted((c for c in candidats if c[0] > 0), reverse=True)
+        graph[article["slug"]] = [slug for _, _, slug in candidats[:count]]
+    return graph
+
+
+def save_related(directory, articles):
+    """Écrit un fichier par article, supprime ceux des articles disparus."""
+    by_slug = {article["slug"]: article for article in articles}
+    out = Path(directory)
+    out.mkdir(parents=True, exist_ok=True)
+    for slug, related in related_graph(articles).items():
+        cards = [
+            {k: by_slug[r][k] for k in CARD_FIELDS if k in by_slug[r]}
+            for r in related
+        ]
+        contenu = json.dumps(cards, ensure_ascii=False, separators=(",", ":"))
+        path = out / f"{slug}.json"
+        if not path.exists() or path.read_text(encoding="utf-8") != contenu:
+            path.write_text(contenu, encoding="utf-8")
+    for path in out.glob("*.json"):
+        if path.stem not in by_slug:
+            path.unlink()
@@ -0,0 +1,102 @@
+"""
+═══════════════════════════════════════════════════════════
+  Index de recherche du blog — Laura Ballo Coaching
+═══════════════════════════════════════════════════════════
+  Utilisé par publish.py (save_articles_json) ; lu par
+  assets/js/blog.js (searchArticles).
+
+  Le texte des articles est normalisé une fois, à la publication
+  (minuscules, accents retirés, mots de 3 lettres et plus), au lieu
+  de l'être à chaque frappe dans le navigateur :
+
+    {
+      "docs":     ["slug", …],              ordre de articles.json
+      "fields":   ["title", …],             bit i ↔ champ i
+      "weights":  [3, 2, 2, 1],             poids du champ i
+      "tokens":   ["emotion", …],           triés
+      "postings": [[doc, champs, doc, champs, …], …]   un par token
+      "grams":    {"emo": [i, …], …}        trigrammes → tokens qui
+                                            les contiennent
+      "keywords": {"prise de parole": [doc, …], …}   mots-clés normalisés
+    }
+
+  Comme l'ancien scoring de blog.js, un mot tapé trouve les tokens qui
+  le CONTIENNENT (« sensible » → hypersensible) : ses trigrammes donnent
+  les candidats, la sous-chaîne est vérifiée sur ces seuls tokens.
+  Poids par champ (une fois par mot) : titre 3, extrait 2, tags 2,
+  mots-clés 1. Le bonus de phrase (requête entière dans le titre,
+  l'extrait, un tag ; mot-clé contenant la requête ou contenu dedans)
+  est calculé côté client : titre, extrait et tags sont sur les cartes
+  du listing, les mots-clés (absents des cartes) dans "keywords".
+═══════════════════════════════════════════════════════════
+"""
+
+
+import json
+import re
+import unicodedata
+
+# ─────────────────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────────────────
+FIELD_WEIGHTS = {"title": 3, "excerpt": 2, "tags": 2, "searchKeywords": 1}
+GRAM_LENGTH = 3     # = longueur minimale d'un mot cherché (blog.js)
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text):
+    """Minuscules sans accents (même résultat que normalize() de blog.js)."""
+    decomposed = unicodedata.normalize("NFD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    return [
+        w for w in WORD_RE.findall(normalize(text))
+        if len(w) >= GRAM_LENGTH
+    ]
+
+
+def grams(token):
+    return {token[i:i + GRAM_LENGTH] for i in range(len(token) - GRAM_LENGTH + 1)}
+
+
+def build_search_index(articles):
+    """Index inversé compact pour la liste `articles` (entrées de articles.json)."""
+    fields = {}                                   # token → {doc: masque de champs}
+    for doc, article in enumerate(articles):
+        for bit, field in enumerate(FIELD_WEIGHTS):
+            value = article.get(field) or ""
+            text = " ".join(value) if isinstance(value, list) else value
+            for token in set(tokenize(text)):
+                postings = fields.setdefault(token, {})
+                postings[doc] = postings.get(doc, 0) | (1 << bit)
+
+    keywords = {}
+    for doc, article in enumerate(articles):
+        for keyword in article.get("searchKeywords") or []:
+            keywords.setdefault(normalize(keyword), []).append(doc)
+
+    tokens = sorted(fields)
+    table = {}
+    for i, token in enumerate(tokens):
+        for gram in sorted(grams(token)):
+            table.setdefault(gram, []).append(i)
+    return {
+        "docs": [article["slug"] for article in articles],
+        "fields": list(FIELD_WEIGHTS),
+        "weights": list(FIELD_WEIGHTS.values()),
+        "tokens": tokens,
+        "postings": [
+            [n for doc, mask in sorted(fields[t].items()) for n in (doc, mask)]
+            for t in tokens
+        ],
+        "grams": table,
+        "keywords": keywords,
+    }
+
+
+def save_search_index(path, articles):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(build_search_index(articles), f, ensure_ascii=False, separators=(",", ":"))
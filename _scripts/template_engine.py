@@ -0,0 +1,72 @@
+"""
+═══════════════════════════════════════════════════════════
+  Moteur de gabarits compilés — Laura Ballo Coaching
+═══════════════════════════════════════════════════════════
+  Utilisé par publish.py (article.html) et publish_formations.py
+  (formation.html, formations-index.html).
+
+  Un gabarit est découpé une seule fois en segments littéraux et en
+  slots {{NOM}} ; le rendu remplit les slots et fait un seul join, au
+  lieu d'un str.replace (donc d'une copie du document) par slot.
+
+    compile_template(source, slots, nom)
+      → Template mis en cache (même source + mêmes slots = même objet)
+      → à la compilation, signale les slots du gabarit sans valeur
+        prévue et les valeurs prévues absentes du gabarit
+
+  Une valeur insérée n'est jamais relue : un « {{X}} » présent dans le
+  contenu d'un article reste tel quel.
+═══════════════════════════════════════════════════════════
+"""
+
+import re
+
+SLOT_RE = re.compile(r"\{\{([A-Z_][A-Z0-9_]*)\}\}")
+
+_CACHE = {}
+
+
+class Template:
+    """Gabarit compilé : littéraux et slots alternés, prêts pour un join."""
+
+    __slots__ = ("nom", "parts", "positions", "slots")
+
+    def __init__(self, source, nom="gabarit"):
+        self.nom = nom
+        morceaux = SLOT_RE.split(source)
+        # split → [littéral, slot, littéral, slot, …, littéral]
+        self.parts = morceaux
+        self.positions = tuple((i, morceaux[i]) for i in range(1, len(morceaux), 2))
+        self.slots = frozenset(name for _, name in self.positions)
+
+    def check(self, slots):
+        """(slots sans valeur, valeurs sans slot) pour l'ensemble `slots` prévu."""
+        return sorted(self.slots - slots), sorted(slots - self.slots)
+
+    def render(self, values):
+        """Remplit chaque slot avec str(valeur) ; None et slot absent → ""."""
+        out = self.parts.copy()
+        for i, name in self.positions:
+            value = values.get(name)
+            out[i] = "" if value is None else str(value)
+        return "".join(out)
+
+
+def compile_template(source, slots=None, nom="gabarit"):
+    """
+    Template compilé pour `source`, mis en cache. Si `slots` (les clés que
+    l'appelant fournira) est donné, les écarts sont affichés une fois, ici.
+    """
+    slots = frozenset(slots) if slots is not None else None
+    key = (source, slots)
+    template = _CACHE.get(key)
+    if template is None:
+        template = Template(source, nom)
+        if slots is not None:
+            sans_valeur, sans_slot = template.check(slots)
+            if sans_valeur:
+                print(f"    ⚠️  {nom} : slots non remplis : {', '.join(sans_valeur)}")
+            if sans_slot:
+                print(f"    ℹ️  {nom} : valeurs sans slot : {', '.join(sans_slot)}")
+        _CACHE[key] = template
+    return template
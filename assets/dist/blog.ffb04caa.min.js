@@ -0,0 +1,319 @@
+let allArticles=[];
+let articlesBySlug=new Map();
+let searchIndex=null;
+let listing=null;
+let nextPage=0;
+const shards=new Map();
+document.addEventListener('DOMContentLoaded',()=>{
+loadArticles();
+setupEventListeners();
+});
+async function loadArticles(){
+try{
+const response=await fetch('/blog/listing.json');
+listing=await response.json();
+addArticles(listing.articles);
+renderArticles(allArticles);
+renderFeatured();
+renderRecent();
+}catch(error){
+console.error('Erreur chargement articles:',error);
+}
+}
+function addArticles(articles){
+articles.forEach(article=>{
+if(articlesBySlug.has(article.slug))return;
+articlesBySlug.set(article.slug,article);
+allArticles.push(article);
+});
+}
+function fetchShard(name){
+if(!shards.has(name)){
+shards.set(name,fetch(`/blog/listing/${name}`)
+.then(response=>response.json())
+.catch(error=>{
+shards.delete(name);
+throw error;
+}));
+}
+return shards.get(name);
+}
+async function loadNextPage(){
+const name=listing.pages[nextPage];
+const articles=await fetchShard(name);
+if(listing.pages[nextPage]===name){
+nextPage++;
+addArticles(articles);
+}
+}
+async function loadAllArticles(){
+if(!listing)return;
+await Promise.all(listing.pages.slice(nextPage).map(fetchShard));
+while(nextPage<listing.pages.length)await loadNextPage();
+}
+async function loadFiltered(kind,key){
+const name=listing&&listing[kind][key];
+return name?fetchShard(name):[];
+}
+function setupEventListeners(){
+const searchInput=document.querySelector('.search-minimal input');
+if(searchInput){
+searchInput.addEventListener('input',debounce(handleSearch,300));
+}
+window.addEventListener('collection-changed',async(e)=>{
+const tag=e.detail&&e.detail.tag;
+if(!tag)return;
+if(tag==='all'){
+renderArticles(allArticles);
+return;
+}
+try{
+renderArticles(await loadFiltered('tags',tag));
+scrollToArticles();
+}catch(error){
+console.error('Erreur chargement collection:',error);
+}
+});
+const situationItems=document.querySelectorAll('.situation-item');
+situationItems.forEach(item=>{
+item.addEventListener('click',(e)=>{
+e.preventDefault();
+handleSituationClick(item);
+});
+});
+}
+function debounce(func,wait){
+let timeout;
+return function executedFunction(...args){
+const later=()=>{
+clearTimeout(timeout);
+func(...args);
+};
+clearTimeout(timeout);
+timeout=setTimeout(later,wait);
+};
+}
+async function handleSearch(e){
+const query=e.target.value.trim().toLowerCase();
+if(query===''){
+renderArticles(allArticles);
+return;
+}
+try{
+const[index]=await Promise.all([loadSearchIndex(),loadAllArticles()]);
+const results=searchArticles(index,query);
+renderArticles(results);
+scrollToArticles();
+}catch(error){
+console.error('Erreur recherche:',error);
+}
+}
+function loadSearchIndex(){
+if(!searchIndex){
+searchIndex=fetch('/blog/search-index.json')
+.then(response=>response.json())
+.catch(error=>{
+searchIndex=null;
+throw error;
+});
+}
+return searchIndex;
+}
+const normalize=(str)=>str.toLowerCase()
+.normalize('NFD')
+.replace(/[\u0300-\u036f]/g,'');
+function tokensContaining(index,word){
+let candidates=null;
+for(let i=0;i+3<=word.length;i++){
+const ids=index.grams[word.slice(i,i+3)];
+if(!ids)return[];
+if(!candidates||ids.length<candidates.length)candidates=ids;
+}
+return candidates.filter(t=>index.tokens[t].includes(word));
+}
+function searchArticles(index,query){
+const queryNorm=normalize(query);
+const queryWords=queryNorm.split(/[^a-z0-9]+/).filter(w=>w.length>2);
+const scores=new Map();
+const add=(doc,points)=>scores.set(doc,(scores.get(doc)||0)+points);
+queryWords.forEach(word=>{
+const masks=new Map();
+tokensContaining(index,word).forEach(t=>{
+const postings=index.postings[t];
+for(let i=0;i<postings.length;i+=2){
+masks.set(postings[i],(masks.get(postings[i])||0)|postings[i+1]);
+}
+});
+masks.forEach((mask,doc)=>{
+index.weights.forEach((weight,bit)=>{
+if(mask&(1<<bit))add(doc,weight);
+});
+});
+});
+Object.entries(index.keywords).forEach(([keyword,docs])=>{
+if(keyword.includes(queryNorm))docs.forEach(doc=>add(doc,10));
+if(queryNorm.includes(keyword))docs.forEach(doc=>add(doc,10));
+});
+const candidates=queryWords.length?[...scores.keys()]:index.docs.map((_,doc)=>doc);
+candidates.forEach(doc=>{
+const article=articlesBySlug.get(index.docs[doc]);
+if(!article)return;
+if(normalize(article.title).includes(queryNorm))add(doc,30);
+if(normalize(article.excerpt||'').includes(queryNorm))add(doc,20);
+(article.tags||[]).forEach(tag=>{
+if(normalize(tag).includes(queryNorm))add(doc,20);
+});
+});
+return[...scores]
+.map(([doc,score])=>({doc,score,article:articlesBySlug.get(index.docs[doc])}))
+.filter(item=>item.article)
+.sort((a,b)=>b.score-a.score||a.doc-b.doc)
+.map(item=>item.article);
+}
+async function handleCollectionClick(btn){
+document.querySelectorAll('.collection-btn').forEach(b=>b.classList.remove('active'));
+btn.classList.add('active');
+const tag=btn.dataset.tag;
+if(!tag||tag==='all'){
+renderArticles(allArticles);
+return;
+}
+try{
+renderArticles(await loadFiltered('tags',tag));
+scrollToArticles();
+}catch(error){
+console.error('Erreur chargement collection:',error);
+}
+}
+async function handleSituationClick(item){
+const situation=item.dataset.situation;
+try{
+renderArticles(await loadFiltered('situations',situation));
+scrollToArticles();
+}catch(error){
+console.error('Erreur chargement situation:',error);
+}
+}
+function scrollToArticles(){
+const section=document.querySelector('.articles-section');
+if(section){
+setTimeout(()=>{
+section.scrollIntoView({behavior:'smooth',block:'start'});
+},100);
+}
+}
+function renderFeatured(){
+const container=document.querySelector('.featured-hero-card');
+if(!container)return;
+const featured=allArticles.find(a=>a.featured)||allArticles[0];
+if(!featured)return;
+container.href=featured.url;
+container.innerHTML=`
+    <img src="${featured.image}" ${responsiveAttrs(featured, '(max-width: 1024px) 100vw, 55vw')} alt="${featured.title}" class="featured-hero-image" loading="eager">
+    <div class="featured-hero-content">
+      <span class="featured-hero-tag">À la une · ${featured.category}</span>
+      <h2 class="featured-hero-title">${featured.title}</h2>
+      <p class="featured-hero-excerpt">${featured.excerpt}</p>
+      <p class="featured-hero-meta">${formatDate(featured.date)} · ${featured.readingTime}</p>
+      <span class="featured-hero-link">Lire l'article</span>
+    </div>
+  `;
+}
+function renderRecent(){
+const container=document.querySelector('.featured-grid');
+if(!container)return;
+const recent=[...allArticles]
+.sort((a,b)=>new Date(b.date)-new Date(a.date))
+.slice(0,3);
+container.innerHTML=recent.map(article=>`
+    <a href="${article.url}" class="featured-card">
+      <img src="${article.image}" ${responsiveAttrs(article, '(max-width: 1024px) 100vw, 33vw')} alt="${article.title}" class="featured-image" loading="lazy">
+      <span class="featured-tag">${article.category}</span>
+      <h3 class="featured-title">${article.title}</h3>
+      <p class="featured-excerpt">${article.excerpt}</p>
+      <p class="featured-meta">${formatDate(article.date)} · ${article.readingTime}</p>
+    </a>
+  `).join('');
+}
+function renderArticles(articles){
+const container=document.querySelector('.articles-list');
+if(!container)return;
+if(articles.length===0){
+container.innerHTML='<p style="text-align:center;color:var(--gray-brown);font-size:18px;">Aucun article trouvé.</p>';
+return;
+}
+container.innerHTML=articles.map(article=>`
+    <a href="${article.url}" class="article-item">
+      <div class="article-image-container">
+        <img src="${article.image}" ${responsiveAttrs(article, '(max-width: 1024px) 100vw, 40vw')} alt="${article.title}" class="article-image" loading="lazy">
+      </div>
+      <div class="article-content">
+        <span class="article-date">${formatDate(article.date)}</span>
+        <h3 class="article-title">${article.title}</h3>
+        <p class="article-excerpt">${article.excerpt}</p>
+        <span class="article-read-more">Lire l'article</span>
+      </div>
+    </a>
+  `).join('');
+if(articles===allArticles&&listing&&nextPage<listing.pages.length){
+const more=document.createElement('p');
+more.style.cssText='text-align:center;margin-top:40px;';
+more.innerHTML=`<button class="collection-btn">Plus d'articles (${allArticles.length}/${listing.total})</button>`;
+more.firstChild.addEventListener('click',async()=>{
+try{
+await loadNextPage();
+renderArticles(allArticles);
+}catch(error){
+console.error('Erreur chargement articles:',error);
+}
+});
+container.appendChild(more);
+}
+}
+function responsiveAttrs(article,sizes){
+if(!article.imageSrcset)return'';
+return`srcset="${article.imageSrcset}" sizes="${sizes}" width="${article.imageWidth}" height="${article.imageHeight}"`;
+}
+function formatDate(dateStr){
+const date=new Date(dateStr);
+const options={year:'numeric',month:'long',day:'numeric'};
+return date.toLocaleDateString('fr-FR',options);
+}
+async function loadRelatedArticles(currentSlug,currentTags){
+try{
+const response=await fetch(`/blog/related/${encodeURIComponent(currentSlug)}.json`);
+const related=response.ok?await response.json():[];
+renderRelatedArticles(related);
+}catch(error){
+console.error('Erreur chargement articles recommandés:',error);
+}
+}
+function renderRelatedArticles(articles){
+const container=document.querySelector('.articles-grid');
+if(!container)return;
+if(articles.length===0){
+container.innerHTML='<p style="text-align:center;color:var(--muted);">Aucun article similaire trouvé.</p>';
+return;
+}
+container.innerHTML=articles.map(article=>`
+    <a href="${article.url}" class="article-card">
+      <img src="${article.image}" ${responsiveAttrs(article, '(max-width: 1024px) 100vw, 33vw')} alt="${article.title}" class="article-card-image" loading="lazy">
+      <div class="article-card-tags">
+        ${article.tags.slice(0, 2).map(tag => `<span class="tag">${tag}</span>`).join('')}
+      </div>
+      <h4 class="article-card-title">${article.title}</h4>
+      <p class="article-card-excerpt">${article.excerpt}</p>
+      <p class="article-card-meta">${article.readingTime}</p>
+    </a>
+  `).join('');
+}
+window.addEventListener('scroll',function(){
+const nav=document.querySelector('.nav');
+if(nav){
+if(window.scrollY>100){
+nav.classList.add('scrolled');
+}else{
+nav.classList.remove('scrolled');
+}
+}
+});
@@ -3,7 +3,12 @@
 // Recherche + Filtres + Recommandations
 // ========================================
 
-let allArticles = [];
+let allArticles = [];        // articles chargés jusqu'ici (pages du listing)
+let articlesBySlug = new Map();
+let searchIndex = null;
+let listing = null;           // blog/listing.json (généré par publish.py)
+let nextPage = 0;             // prochain shard de listing.pages à charger
+const shards = new Map();
 
 // Charger les articles au démarrage
 document.addEventListener('DOMContentLoaded', () => {
@@ -11,12 +16,12 @@ document.addEventListener('DOMContentLoaded', () => {
   setupEventListeners();
 });
 
-// Charger articles.json
+// Charger le manifeste du listing (1re page incluse)
 async function loadArticles() {
   try {
-    const response = await fetch('/blog/articles.json');
-    const data = await response.json();
-    allArticles = data.articles;
+    const response = await fetch('/blog/listing.json');
+    listing = await response.json();
+    addArticles(listing.articles);
     
     renderArticles(allArticles);
     renderFeatured();
@@ -26,6 +31,49 @@ async function loadArticles() {
   }
 }
 
+function addArticles(articles) {
+  articles.forEach(article => {
+    if (articlesBySlug.has(article.slug)) return;
+    articlesBySlug.set(article.slug, article);
+    allArticles.push(article);
+  });
+}
+
+// Shards versionnés de blog/listing/ (un seul fetch par shard)
+function fetchShard(name) {
+  if (!shards.has(name)) {
+    shards.set(name, fetch(`/blog/listing/${name}`)
+      .then(response => response.json())
+      .catch(error => {
+        shards.delete(name);
+        throw error;
+      }));
+  }
+  return shards.get(name);
+}
+
+async function loadNextPage() {
+  const name = listing.pages[nextPage];
+  const articles = await fetchShard(name);
+  if (listing.pages[nextPage] === name) {
+    nextPage++;
+    addArticles(articles);
+  }
+}
+
+// Toutes les pages (pour la recherche), téléchargées en parallèle
+async function loadAllArticles() {
+  if (!listing) return;
+  await Promise.all(listing.pages.slice(nextPage).map(fetchShard));
+  while (nextPage < listing.pages.length) await loadNextPage();
+}
+
+// Articles d'une collection ('tags') ou d'une situation ('situations')
+async function loadFiltered(kind, key) {
+  const name = listing && listing[kind][key];
+  return name ? fetchShard(name) : [];
+}
+
 // Setup event listeners
 function setupEventListeners() {
   // Recherche
@@ -39,16 +87,19 @@ function setupEventListeners() {
   // #collections-grid et dispatche un CustomEvent 'collection-changed' sur window.
   // Ça résout le problème de timing : les boutons sont générés dynamiquement après
   // un fetch() async, donc un listener direct au chargement ne les trouverait pas.
-  window.addEventListener('collection-changed', (e) => {
+  window.addEventListener('collection-changed', async (e) => {
     const tag = e.detail && e.detail.tag;
     if (!tag) return;
     if (tag === 'all') {
       renderArticles(allArticles);
       return;
     }
-    const filtered = allArticles.filter(article => article.tags.includes(tag));
-    renderArticles(filtered);
-    scrollToArticles();
+    try {
+      renderArticles(await loadFiltered('tags', tag));
+      scrollToArticles();
+    } catch (error) {
+      console.error('Erreur chargement collection:', error);
+    }
   });
   
   // Situations
@@ -76,7 +127,7 @@ function debounce(func, wait) {
 }
 
 // Recherche
-function handleSearch(e) {
+async function handleSearch(e) {
   const query = e.target.value.trim().toLowerCase();
   
   if (query === '') {
@@ -84,62 +135,100 @@ function handleSearch(e) {
     return;
   }
   
-  const results = searchArticles(query);
-  renderArticles(results);
-  scrollToArticles();
+  try {
+    const [index] = await Promise.all([loadSearchIndex(), loadAllArticles()]);
+    const results = searchArticles(index, query);
+    renderArticles(results);
+    scrollToArticles();
+  } catch (error) {
+    console.error('Erreur recherche:', error);
+  }
 }
 
-// Algorithme de scoring
-function searchArticles(query) {
-  const normalize = (str) => str.toLowerCase()
-    .normalize('NFD')
-    .replace(/[\u0300-\u036f]/g, '');
-  
+// Index inversé généré par publish.py (chargé à la première recherche)
+function loadSearchIndex() {
+  if (!searchIndex) {
+    searchIndex = fetch('/blog/search-index.json')
+      .then(response => response.json())
+      .catch(error => {
+        searchIndex = null;
+        throw error;
+      });
+  }
+  return searchIndex;
+}
+
+const normalize = (str) => str.toLowerCase()
+  .normalize('NFD')
+  .replace(/[\u0300-\u036f]/g, '');
+
+// Tokens de l'index qui contiennent `word` : on part du trigramme le
+// plus rare du mot, puis on vérifie la sous-chaîne sur ces seuls tokens.
+function tokensContaining(index, word) {
+  let candidates = null;
+  for (let i = 0; i + 3 <= word.length; i++) {
+    const ids = index.grams[word.slice(i, i + 3)];
+    if (!ids) return [];
+    if (!candidates || ids.length < candidates.length) candidates = ids;
+  }
+  return candidates.filter(t => index.tokens[t].includes(word));
+}
+
+// Algorithme de scoring (mêmes articles que l'ancien parcours complet) :
+// - chaque mot trouve les tokens qui le contiennent ; poids par champ
+//   précalculés (titre 3, extrait 2, tags 2, mots-clés 1)
+// - bonus de phrase : requête entière dans le titre (+30), l'extrait (+20),
+//   un tag (+20) ; mot-clé qui contient la requête ou y est contenu (+10)
+function searchArticles(index, query) {
   const queryNorm = normalize(query);
-  const queryWords = queryNorm.split(/\s+/).filter(w => w.length > 2);
+  const queryWords = queryNorm.split(/[^a-z0-9]+/).filter(w => w.length > 2);
   
-  return allArticles
-    .map(article => {
-      let score = 0;
-      
-      // Titre (×3)
-      if (normalize(article.title).includes(queryNorm)) score += 30;
-      queryWords.forEach(word => {
-        if (normalize(article.title).includes(word)) score += 3;
-      });
-      
-      // Excerpt (×2)
-      if (normalize(article.excerpt).includes(queryNorm)) score += 20;
-      queryWords.forEach(word => {
-        if (normalize(article.excerpt).includes(word)) score += 2;
-      });
-      
-      // Tags (×2)
-      article.tags.forEach(tag => {
-        if (normalize(tag).includes(queryNorm)) score += 20;
-        queryWords.forEach(word => {
-          if (normalize(tag).includes(word)) score += 2;
-        });
-      });
-      
-      // Keywords (×1)
-      article.searchKeywords.forEach(keyword => {
-        if (normalize(keyword).includes(queryNorm)) score += 10;
-        if (queryNorm.includes(normalize(keyword))) score += 10;
-        queryWords.forEach(word => {
-          if (normalize(keyword).includes(word)) score += 1;
-        });
+  const scores = new Map();   // doc → score
+  const add = (doc, points) => scores.set(doc, (scores.get(doc) || 0) + points);
+  
+  queryWords.forEach(word => {
+    const masks = new Map();   // doc → champs qui contiennent le mot
+    tokensContaining(index, word).forEach(t => {
+      const postings = index.postings[t];
+      for (let i = 0; i < postings.length; i += 2) {
+        masks.set(postings[i], (masks.get(postings[i]) || 0) | postings[i + 1]);
+      }
+    });
+    masks.forEach((mask, doc) => {
+      index.weights.forEach((weight, bit) => {
+        if (mask & (1 << bit)) add(doc, weight);
       });
-      
-      return { article, score };
-    })
-    .filter(item => item.score > 0)
-    .sort((a, b) => b.score - a.score)
+    });
+  });
+  
+  // Mots-clés : absents des cartes, normalisés dans l'index
+  Object.entries(index.keywords).forEach(([keyword, docs]) => {
+    if (keyword.includes(queryNorm)) docs.forEach(doc => add(doc, 10));
+    if (queryNorm.includes(keyword)) docs.forEach(doc => add(doc, 10));
+  });
+  
+  // Titre, extrait, tags : un article qui contient la requête entière
+  // contient aussi ses mots, sauf si aucun ne fait 3 lettres → tout parcourir
+  const candidates = queryWords.length ? [...scores.keys()] : index.docs.map((_, doc) => doc);
+  candidates.forEach(doc => {
+    const article = articlesBySlug.get(index.docs[doc]);
+    if (!article) return;
+    if (normalize(article.title).includes(queryNorm)) add(doc, 30);
+    if (normalize(article.excerpt || '').includes(queryNorm)) add(doc, 20);
+    (article.tags || []).forEach(tag => {
+      if (normalize(tag).includes(queryNorm)) add(doc, 20);
+    });
+  });
+  
+  return [...scores]
+    .map(([doc, score]) => ({ doc, score, article: articlesBySlug.get(index.docs[doc]) }))
+    .filter(item => item.article)
+    .sort((a, b) => b.score - a.score || a.doc - b.doc)
     .map(item => item.article);
 }
 
 // Collection filter
-function handleCollectionClick(btn) {
+async function handleCollectionClick(btn) {
   // Toggle active
   document.querySelectorAll('.collection-btn').forEach(b => b.classList.remove('active'));
   btn.classList.add('active');
@@ -151,24 +240,24 @@ function handleCollectionClick(btn) {
     return;
   }
   
-  const filtered = allArticles.filter(article => 
-    article.tags.includes(tag)
-  );
-  
-  renderArticles(filtered);
-  scrollToArticles();
+  try {
+    renderArticles(await loadFiltered('tags', tag));
+    scrollToArticles();
+  } catch (error) {
+    console.error('Erreur chargement collection:', error);
+  }
 }
 
 // Situation filter
-function handleSituationClick(item) {
+async function handleSituationClick(item) {
   const situation = item.dataset.situation;
   
-  const filtered = allArticles.filter(article => 
-    article.situations && article.situations.includes(situation)
-  );
-  
-  renderArticles(filtered);
-  scrollToArticles();
+  try {
+    renderArticles(await loadFiltered('situations', situation));
+    scrollToArticles();
+  } catch (error) {
+    console.error('Erreur chargement situation:', error);
+  }
 }
 
 // Scroll vers articles
@@ -191,7 +280,7 @@ function renderFeatured() {
   
   container.href = featured.url;
   container.innerHTML = `
-    <img src="${featured.image}" alt="${featured.title}" class="featured-hero-image" loading="eager">
+    <img src="${featured.image}" ${responsiveAttrs(featured, '(max-width: 1024px) 100vw, 55vw')} alt="${featured.title}" class="featured-hero-image" loading="eager">
     <div class="featured-hero-content">
       <span class="featured-hero-tag">À la une · ${featured.category}</span>
       <h2 class="featured-hero-title">${featured.title}</h2>
@@ -213,7 +302,7 @@ function renderRecent() {
   
   container.innerHTML = recent.map(article => `
     <a href="${article.url}" class="featured-card">
-      <img src="${article.image}" alt="${article.title}" class="featured-image" loading="lazy">
+      <img src="${article.image}" ${responsiveAttrs(article, '(max-width: 1024px) 100vw, 33vw')} alt="${article.title}" class="featured-image" loading="lazy">
       <span class="featured-tag">${article.category}</span>
       <h3 class="featured-title">${article.title}</h3>
       <p class="featured-excerpt">${article.excerpt}</p>
@@ -235,7 +324,7 @@ function renderArticles(articles) {
   container.innerHTML = articles.map(article => `
     <a href="${article.url}" class="article-item">
       <div class="article-image-container">
-        <img src="${article.image}" alt="${article.title}" class="article-image" loading="lazy">
+        <img src="${article.image}" ${responsiveAttrs(article, '(max-width: 1024px) 100vw, 40vw')} alt="${article.title}" class="article-image" loading="lazy">
       </div>
       <div class="article-content">
         <span class="article-date">${formatDate(article.date)}</span>
@@ -245,6 +334,28 @@ function renderArticles(articles) {
       </div>
     </a>
   `).join('');
+  
+  // Pages suivantes du listing, à la demande
+  if (articles === allArticles && listing && nextPage < listing.pages.length) {
+    const more = document.createElement('p');
+    more.style.cssText = 'text-align:center;margin-top:40px;';
+    more.innerHTML = `<button class="collection-btn">Plus d'articles (${allArticles.length}/${listing.total})</button>`;
+    more.firstChild.addEventListener('click', async () => {
+      try {
+        await loadNextPage();
+        renderArticles(allArticles);
+      } catch (error) {
+        console.error('Erreur chargement articles:', error);
+      }
+    });
+    container.appendChild(more);
+  }
+}
+
+// Attributs responsive (srcset générés par publish.py)
+function responsiveAttrs(article, sizes) {
+  if (!article.imageSrcset) return '';
+  return `srcset="${article.imageSrcset}" sizes="${sizes}" width="${article.imageWidth}" height="${article.imageHeight}"`;
 }
 
 // Format date
@@ -258,24 +369,13 @@ function formatDate(dateStr) {
 // ARTICLES RECOMMANDÉS (pour pages articles)
 // ========================================
 
+// Recommandations précalculées par publish.py (blog/related/<slug>.json) :
+// plus besoin de télécharger et scorer tout articles.json.
+// currentTags reste accepté pour les pages déjà générées.
 async function loadRelatedArticles(currentSlug, currentTags) {
   try {
-    const response = await fetch('/blog/articles.json');
-    const data = await response.json();
-    const allArticles = data.articles;
-    
-    // Filtrer les articles avec tags similaires
-    const related = allArticles
-      .filter(article => article.slug !== currentSlug)
-      .map(article => {
-        const commonTags = article.tags.filter(tag => currentTags.includes(tag));
-        return { article, score: commonTags.length };
-      })
-      .filter(item => item.score > 0)
-      .sort((a, b) => b.score - a.score)
-      .slice(0, 3)
-      .map(item => item.article);
-    
+    const response = await fetch(`/blog/related/${encodeURIComponent(currentSlug)}.json`);
+    const related = response.ok ? await response.json() : [];
     renderRelatedArticles(related);
   } catch (error) {
     console.error('Erreur chargement articles recommandés:', error);
@@ -293,7 +393,7 @@ function renderRelatedArticles(articles) {
   
   container.innerHTML = articles.map(article => `
     <a href="${article.url}" class="article-card">
-      <img src="${article.image}" alt="${article.title}" class="article-card-image" loading="lazy">
+      <img src="${article.image}" ${responsiveAttrs(article, '(max-width: 1024px) 100vw, 33vw')} alt="${article.title}" class="article-card-image" loading="lazy">
       <div class="article-card-tags">
         ${article.tags.slice(0, 2).map(tag => `<span class="tag">${tag}</span>`).join('')}
       </div>
@@ -6,6 +6,11 @@
  * 
  * Charge automatiquement : header, footer, bannière cookies
  * 
+ * Les pages générées (articles, formations) et les pages statiques
+ * passées par _scripts/inline_components.py contiennent déjà les
+ * composants : aucun fetch n'est fait. Le chargement ci-dessous ne sert
+ * plus que de secours pour une page encore munie d'un emplacement vide.
+ * 
  * UTILISATION dans chaque page :
  * <div id="header-placeholder"></div>
  * <div id="footer-placeholder"></div>
@@ -63,7 +68,7 @@
   async function loadComponent(name, config) {
     const placeholder = document.getElementById(config.placeholder);
     if (!placeholder) {
-      console.warn(`[Includes] Placeholder #${config.placeholder} non trouvé`);
+      // Composant intégré au build (ou absent de cette page) : rien à charger
       return false;
     }
 
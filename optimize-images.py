@@ -5,18 +5,49 @@ optimize-images.py — Optimisation images lauraballo.com
 Convertit JPG/PNG → WebP et compresse les images existantes.
 Met à jour les références HTML/CSS automatiquement.
 
+Incrémental : MANIFEST_PATH mémorise pour chaque source son hash, sa
+taille, son mtime, les réglages d'encodage et le hash du WebP produit.
+Seules les sources nouvelles ou modifiées, ou toutes si WEBP_QUALITY /
+MAX_WIDTH changent, sont ré-encodées. Un WebP déjà présent sans entrée
+dans le manifeste (produit avant lui) est adopté tel quel. Le manifeste
+vit dans .cache/ (ignoré par git) : le supprimer force juste une
+vérification complète au run suivant.
+
+--search : la qualité n'est plus fixe mais cherchée image par image
+(_scripts/image_quality.py) : la plus basse dont le SSIM avec la source
+reste au-dessus de IMAGE_TARGET_SSIM. Un .avif est écrit à côté du
+.webp quand il est plus léger, et les pages le proposent en premier :
+  <img src="x.webp">           → <picture><source type="image/avif"
+                                  srcset="x.avif"><img src="x.webp"></picture>
+  background-image: url(x.webp) → + background-image: image-set(
+                                  url(x.avif) type("image/avif"), …)
+Le .webp reste la source de repli. Sans .avif (mode fixe, ou AVIF plus
+lourd), ces ajouts sont retirés.
+
 Usage :
-  python3 optimize-images.py
+  python3 optimize-images.py              # tous les cœurs
+  python3 optimize-images.py --jobs 1     # séquentiel
+  python3 optimize-images.py --search     # qualité par image + AVIF
 
 À lancer depuis la RACINE du repo GitHub local.
 """
 
+import argparse
+import hashlib
+import json
 import os
 import re
 import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from PIL import Image
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "_scripts"))
+import image_quality  # noqa: E402
+
 # ── CONFIG ─────────────────────────────────────────────────────────────────
 IMG_DIR       = Path("assets/img")        # dossier images
 HTML_DIRS     = [Path(".")]               # cherche les HTML récursivement
@@ -24,27 +55,117 @@ WEBP_QUALITY  = 82                        # 0-100 — bon compromis qualité/poi
 JPEG_QUALITY  = 82                        # pour les JPG gardés en fallback
 MAX_WIDTH     = 1920                      # resize si plus large (px)
 EXTENSIONS    = {".jpg", ".jpeg", ".png"} # formats à traiter
-SKIP_ALREADY  = True                      # saute si .webp existe déjà
-BACKUP        = True                      # crée assets/img/_backup/ avant tout
+WEBP_METHOD   = 6                         # effort d'encodage WebP (0-6)
+BACKUP        = True                      # sauvegarde dans _backup/ tout WebP écrasé
+MANIFEST_PATH = Path(".cache/optimize-images.json")  # cache local, non versionné
 # ───────────────────────────────────────────────────────────────────────────
 
+SETTINGS = {"quality": WEBP_QUALITY, "max_width": MAX_WIDTH, "method": WEBP_METHOD}
+SEARCH_SETTINGS = {
+    "mode": "search", "target": image_quality.TARGET_SSIM,
+    "max_width": MAX_WIDTH, "method": WEBP_METHOD,
+}
 
-def backup_images():
-    backup_dir = IMG_DIR / "_backup"
-    if backup_dir.exists():
-        print(f"  ⚠  Backup déjà présent dans {backup_dir}, skip.")
-        return
-    shutil.copytree(IMG_DIR, backup_dir, ignore=shutil.ignore_patterns("_backup"))
-    print(f"  ✓  Backup créé → {backup_dir}")
+
+def settings_for(search: bool) -> dict:
+    return SEARCH_SETTINGS if search else SETTINGS
+
+
+def load_manifest() -> dict:
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: dict):
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    MANIFEST_PATH.write_text(
+        json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+    )
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
-def convert_to_webp(src: Path) -> Path | None:
-    """Convertit une image en WebP. Retourne le chemin WebP ou None si ignoré."""
+def manifest_entry(src: Path, dst: Path, src_hash: str, settings: dict,
+                   qualities: dict | None = None) -> dict:
+    st = src.stat()
+    entry = {
+        "source_sha256": src_hash,
+        "size": st.st_size,
+        "mtime": st.st_mtime,
+        "settings": settings,
+        "output_sha256": file_sha256(dst),
+        "output_size": dst.stat().st_size,
+    }
+    if qualities:
+        entry["qualities"] = qualities
+    return entry
+
+
+def is_fresh(src: Path, entry: dict | None, settings: dict = SETTINGS) -> bool:
+    """Test rapide, sans lire les fichiers : taille/mtime/réglages identiques."""
+    if not entry or entry.get("settings") != settings:
+        return False
     dst = src.with_suffix(".webp")
-    if SKIP_ALREADY and dst.exists():
-        return dst
+    if not dst.exists() or dst.stat().st_size != entry.get("output_size"):
+        return False
+    st = src.stat()
+    return st.st_size == entry.get("size") and st.st_mtime == entry.get("mtime")
+
+
+def backup_file(path: Path) -> Path | None:
+    """Copie `path` dans _backup/ (même arborescence) avant de l'écraser."""
+    backup = IMG_DIR / "_backup" / path.relative_to(IMG_DIR)
+    if backup.exists():
+        return None
+    backup.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(path, backup)
+    return backup
+
+
+def convert_to_webp(src: Path, entry: dict | None = None, search: bool = False) -> dict:
+    """
+    Convertit une image en WebP si nécessaire. Ne fait aucun affichage (peut
+    tourner dans un processus fils) : retourne {src, dst, status, old, new,
+    entry, backup, error, qualities}, avec dst à None en cas d'échec. `status`
+    vaut converted, unchanged (hash identique) ou adopted (WebP hors manifeste).
+    `search` est passé explicitement : les processus fils ne voient pas args.
+    """
+    dst = src.with_suffix(".webp")
+    settings = settings_for(search)
+    result = {
+        "src": src, "dst": dst, "status": "converted", "old": 0, "new": 0,
+        "entry": None, "backup": None, "error": None, "qualities": None,
+    }
 
     try:
+        src_hash = file_sha256(src)
+        if dst.exists():
+            status = None
+            if entry is None:
+                status = "adopted"
+            elif (
+                entry.get("source_sha256") == src_hash
+                and entry.get("settings") == settings
+                and entry.get("output_sha256") == file_sha256(dst)
+            ):
+                status = "unchanged"
+            if status:
+                result["status"] = status
+                result["entry"] = manifest_entry(
+                    src, dst, src_hash, settings, (entry or {}).get("qualities")
+                )
+                return result
+            if BACKUP:
+                result["backup"] = backup_file(dst)
+
         with Image.open(src) as img:
             # Conversion RGBA si nécessaire
             if img.mode in ("RGBA", "LA"):
@@ -60,27 +181,127 @@ def convert_to_webp(src: Path) -> Path | None:
                 new_h = int(img.height * ratio)
                 img = img.resize((MAX_WIDTH, new_h), Image.LANCZOS)
 
-            img.save(dst, "WEBP", quality=WEBP_QUALITY, method=6)
+            if search:
+                best = image_quality.best_encodings(
+                    img, options={"WEBP": {"method": WEBP_METHOD}}
+                )
+                for fmt, (_, data, _) in best.items():
+                    src.with_suffix(image_quality.EXTENSIONS[fmt]).write_bytes(data)
+                if "AVIF" not in best:
+                    src.with_suffix(".avif").unlink(missing_ok=True)
+                result["qualities"] = {fmt: q for fmt, (q, _, _) in best.items()}
+            else:
+                img.save(dst, "WEBP", quality=WEBP_QUALITY, method=WEBP_METHOD)
+                src.with_suffix(".avif").unlink(missing_ok=True)
 
-        old_kb = src.stat().st_size / 1024
-        new_kb = dst.stat().st_size / 1024
+        result["old"] = src.stat().st_size
+        result["new"] = dst.stat().st_size
+        result["entry"] = manifest_entry(src, dst, src_hash, settings, result["qualities"])
+        return result
+
+    except Exception as e:
+        result["dst"], result["error"] = None, str(e)
+        return result
+
+
+def report(result: dict):
+    """Affiche le résultat d'une conversion (toujours dans le processus principal)."""
+    src = result["src"]
+    if result["error"]:
+        print(f"  ✗  ERREUR {src.name}: {result['error']}")
+    elif result["status"] == "converted":
+        old_kb = result["old"] / 1024
+        new_kb = result["new"] / 1024
         gain   = (1 - new_kb / old_kb) * 100
         print(f"  {src.name:45s} {old_kb:6.0f}KB → {new_kb:6.0f}KB  (-{gain:.0f}%)")
-        return dst
+        if result["qualities"]:
+            formats = ", ".join(f"{f} q{q}" for f, q in result["qualities"].items())
+            print(f"  {'':45s} {formats}")
+        if result["backup"]:
+            print(f"  {'':45s} ancien WebP → {result['backup']}")
+
+
+def convert_all(images: list[Path], entries: list, jobs: int, search: bool = False):
+    """Résultats dans l'ordre de `images`, quel que soit l'ordre de fin des processus."""
+    convert = partial(convert_to_webp, search=search)
+    if jobs <= 1:
+        for src, entry in zip(images, entries):
+            yield convert(src, entry)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(convert, images, entries, chunksize=1)
+
+
+def build_reference_pattern(renames: dict) -> re.Pattern:
+    """Une seule regex pour tous les noms : src="…/nom" et url(…/nom)."""
+    names = "|".join(re.escape(n) for n in sorted(renames, key=len, reverse=True))
+    return re.compile(
+        r'(src=["\'][^"\']*?)(' + names + r')(["\'])'
+        r"|(url\(['\"]?[^'\"()]*?)(" + names + r")(['\"]?\))"
+    )
+
+
+# <img> seul ou déjà enveloppé par nous, et background-image suivi ou non
+# de notre image-set() : la passe est idempotente et retire un AVIF disparu.
+# Un <img> précédé d'un autre <source> (<picture> écrit à la main) est laissé.
+PICTURE_RE = re.compile(
+    r'<picture><source type="image/avif" srcset="[^"]*">(<img\b[^>]*>)</picture>'
+    r"|<source\b[^>]*>\s*<img\b[^>]*>"
+    r"|(<img\b[^>]*>)"
+)
+IMG_SRC_RE = re.compile(r'\bsrc=["\']([^"\']*/)?([^/"\']+\.webp)["\']')
+BACKGROUND_RE = re.compile(
+    r"(?P<indent>[ \t]*)(?P<decl>background-image:\s*url\((?P<q>['\"]?)"
+    r"(?P<dir>[^'\"()]*/)?(?P<name>[^/'\"()]+\.webp)(?P=q)\);)"
+    r"(?:\s*background-image:\s*image-set\([^;]*\);)?"
+)
 
-    except Exception as e:
-        print(f"  ✗  ERREUR {src.name}: {e}")
-        return None
 
+def add_avif_sources(content: str, avif: dict) -> str:
+    """
+    Propose le .avif avant le .webp : <picture> autour des <img> (sauf
+    srcset, déjà responsive), image-set() après les background-image.
+    `avif` : {nom .webp: nom .avif} des images qui ont un AVIF.
+    """
+    def picture(m):
+        img = m.group(1) or m.group(2)
+        if img is None:
+            return m.group(0)
+        ref = IMG_SRC_RE.search(img)
+        if not ref or ref.group(2) not in avif or "srcset=" in img:
+            return img
+        source = f'{ref.group(1) or ""}{avif[ref.group(2)]}'
+        return f'<picture><source type="image/avif" srcset="{source}">{img}</picture>'
 
-def update_html_references(old_name: str, new_name: str):
-    """Remplace les références dans tous les HTML/CSS du repo."""
-    patterns = [
-        (r'src=["\']([^"\']*' + re.escape(old_name) + r')["\']',
-         lambda m: m.group(0).replace(old_name, new_name)),
-        (r"url\(['\"]?([^'\"()]*" + re.escape(old_name) + r")['\"]?\)",
-         lambda m: m.group(0).replace(old_name, new_name)),
-    ]
+    def background(m):
+        if m.group("name") not in avif:
+            return m.group("indent") + m.group("decl")
+        folder = m.group("dir") or ""
+        return (
+            f'{m.group("indent")}{m.group("decl")}\n{m.group("indent")}'
+            f"background-image: image-set(url('{folder}{avif[m.group('name')]}') "
+            f"type('image/avif'), url('{folder}{m.group('name')}') type('image/webp'));"
+        )
+
+    return BACKGROUND_RE.sub(background, PICTURE_RE.sub(picture, content))
+
+
+def update_html_references(renames: dict, avif: dict | None = None):
+    """
+    Remplace les références dans tous les HTML/CSS/JS du repo, en une passe :
+    chaque fichier est lu une fois et réécrit au plus une fois, quel que soit
+    le nombre d'images renommées. `renames` : {ancien nom: nouveau nom}.
+    HTML et CSS reçoivent aussi les sources AVIF (add_avif_sources).
+    """
+    if not renames:
+        return []
+    pattern = build_reference_pattern(renames)
+    avif = avif or {}
+
+    def repl(m):
+        if m.group(2) is not None:
+            return m.group(1) + renames[m.group(2)] + m.group(3)
+        return m.group(4) + renames[m.group(5)] + m.group(6)
 
     changed_files = []
     for html_dir in HTML_DIRS:
@@ -90,9 +311,9 @@ def update_html_references(old_name: str, new_name: str):
                     continue
                 try:
                     content = filepath.read_text(encoding="utf-8")
-                    new_content = content
-                    for pat, repl in patterns:
-                        new_content = re.sub(pat, repl, new_content)
+                    new_content = pattern.sub(repl, content)
+                    if filepath.suffix in (".html", ".css"):
+                        new_content = add_avif_sources(new_content, avif)
                     if new_content != content:
                         filepath.write_text(new_content, encoding="utf-8")
                         changed_files.append(filepath)
@@ -101,7 +322,22 @@ def update_html_references(old_name: str, new_name: str):
     return changed_files
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Optimisation images lauraballo.com")
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=os.cpu_count() or 1,
+        help="nombre de processus de conversion (défaut : nombre de cœurs)",
+    )
+    parser.add_argument(
+        "--search", action="store_true",
+        help="qualité cherchée par image (SSIM), AVIF écrit et référencé s'il est plus léger",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    start = time.perf_counter()
     print("\n╔══════════════════════════════════════════════════╗")
     print("║  optimize-images.py — lauraballo.com             ║")
     print("╚══════════════════════════════════════════════════╝\n")
@@ -110,33 +346,74 @@ def main():
         print(f"✗  Dossier {IMG_DIR} introuvable. Lance ce script depuis la racine du repo.")
         return
 
-    if BACKUP:
-        print("── Backup ──────────────────────────────────────────")
-        backup_images()
-
-    print("\n── Conversion WebP ─────────────────────────────────")
-    images = [
+    print("── Conversion WebP ─────────────────────────────────")
+    images = sorted(
         p for p in IMG_DIR.rglob("*")
         if p.suffix.lower() in EXTENSIONS and "_backup" not in str(p)
-    ]
-    print(f"  {len(images)} images trouvées dans {IMG_DIR}/\n")
+    )
+    manifest = load_manifest()
+    jobs = max(1, args.jobs)
+    settings = settings_for(args.search)
+    if args.search and not image_quality.AVIF_SUPPORTED:
+        print("  ⚠  Pillow sans AVIF : recherche de qualité WebP uniquement.\n")
+
+    renames = {}
+    todo = []
+    for src in images:
+        key = src.as_posix()
+        if is_fresh(src, manifest.get(key), settings):
+            renames[src.name] = src.with_suffix(".webp").name
+        else:
+            todo.append(src)
+    print(
+        f"  {len(images)} images trouvées dans {IMG_DIR}/, "
+        f"{len(todo)} à vérifier — {jobs} processus\n"
+    )
 
     converted = 0
+    unchanged = len(images) - len(todo)
     skipped   = 0
-    refs_updated = set()
+    saved     = 0
+    failures  = []
 
-    for src in sorted(images):
-        dst = convert_to_webp(src)
+    entries = [manifest.get(src.as_posix()) for src in todo]
+    for result in convert_all(todo, entries, jobs, args.search):
+        report(result)
+        src, dst = result["src"], result["dst"]
         if dst is None:
             skipped += 1
+            failures.append((src, result["error"]))
             continue
-        if dst == src.with_suffix(".webp"):
+        manifest[src.as_posix()] = result["entry"]
+        if result["status"] == "converted":
             converted += 1
-            # Mise à jour des références HTML/CSS
-            changed = update_html_references(src.name, dst.name)
-            refs_updated.update(changed)
+            saved += result["old"] - result["new"]
+        else:
+            unchanged += 1
+        renames[src.name] = dst.name
+
+    known = {src.as_posix() for src in images}
+    for key in [k for k in manifest if k not in known]:
+        del manifest[key]
+    save_manifest(manifest)
+
+    print(
+        f"\n  ✓  {converted} images converties, {unchanged} inchangées, "
+        f"{skipped} ignorées."
+    )
+
+    # Mise à jour des références HTML/CSS, toutes images confondues
+    avif = {
+        webp: Path(webp).with_suffix(".avif").name
+        for src in images
+        if (webp := renames.get(src.name)) and src.with_suffix(".avif").exists()
+    }
+    refs_updated = update_html_references(renames, avif)
 
-    print(f"\n  ✓  {converted} images converties, {skipped} ignorées.")
+    if failures:
+        print("\n── Échecs ──────────────────────────────────────────")
+        for src, error in failures:
+            print(f"  ✗  {src}: {error}")
 
     if refs_updated:
         print(f"\n── Références HTML/CSS mises à jour ────────────────")
@@ -146,9 +423,14 @@ def main():
     print("\n── Résumé ──────────────────────────────────────────")
     print("  Les fichiers .webp sont créés à côté des originaux.")
     print("  Les HTML/CSS pointent maintenant vers les .webp.")
-    print("  Les originaux JPG/PNG sont conservés dans _backup/")
+    if avif:
+        print(f"  {len(avif)} .avif proposés en premier (<picture>, image-set()).")
+    print("  Les originaux JPG/PNG sont conservés ; tout WebP écrasé est")
+    print("  sauvegardé dans _backup/ (uniquement les fichiers touchés).")
     print("  ⚠  Vérifie visuellement quelques pages avant de push.")
-    print("  ⚠  Supprime _backup/ après validation.\n")
+    print("  ⚠  Supprime _backup/ après validation.")
+    elapsed = time.perf_counter() - start
+    print(f"  ⏱  {elapsed:.1f}s au total, {saved / 1024 / 1024:.1f} Mo économisés.\n")
 
 
 if __name__ == "__main__":
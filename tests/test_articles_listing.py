@@ -0,0 +1,38 @@
+"""Listing paginé : noms de shards des situations sûrs pour une URL, clés brutes dans le manifeste."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "_scripts"))
+
+from articles_listing import save_listing  # noqa: E402
+from publish import slugify  # noqa: E402
+
+ARTICLES = [
+    {"slug": "a", "title": "A", "tags": [], "situations": ["Prise de parole / Réunion"]},
+    {"slug": "b", "title": "B", "tags": [], "situations": ["stress", "Prise de parole / Réunion"]},
+]
+
+
+class SituationShardsTest(unittest.TestCase):
+    def test_nom_slugifie_cle_brute(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest_path = Path(tmp) / "listing.json"
+            directory = Path(tmp) / "listing"
+            save_listing(manifest_path, directory, ARTICLES, [], slugify)
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+            name = manifest["situations"]["Prise de parole / Réunion"]
+            self.assertTrue(name.startswith("situation-prise-de-parole-reunion."))
+            self.assertEqual(
+                [c["slug"] for c in json.loads((directory / name).read_text(encoding="utf-8"))],
+                ["a", "b"],
+            )
+            self.assertTrue(manifest["situations"]["stress"].startswith("situation-stress."))
+
+
+if __name__ == "__main__":
+    unittest.main()
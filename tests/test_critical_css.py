@@ -0,0 +1,48 @@
+"""CSS critique : cache disque écrit de façon atomique, fichier vide traité comme absent."""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "_scripts"))
+
+import critical_css  # noqa: E402
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        os.chdir(ROOT)                # read_stylesheet lit /assets/… depuis la racine
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = critical_css.CACHE_DIR
+        critical_css.CACHE_DIR = self.tmp.name
+        critical_css.critical_template.cache_clear()
+        self.template = (ROOT / "_templates" / "article.html").read_text(encoding="utf-8")
+        self.stylesheets = critical_css.STYLESHEET_RE.findall(self.template)
+
+    def tearDown(self):
+        critical_css.CACHE_DIR = self.dir
+        critical_css.critical_template.cache_clear()
+        self.tmp.cleanup()
+        os.chdir(self.cwd)
+
+    def test_fichier_vide_recalcule(self):
+        cache = Path(self.tmp.name) / f"{critical_css.cache_key(self.template, self.stylesheets)}.css"
+        cache.write_text("", encoding="utf-8")
+        html = critical_css.critical_template(self.template)
+        critical = cache.read_text(encoding="utf-8")
+        self.assertTrue(critical)
+        self.assertIn(f'<style id="critical-css">{critical}</style>', html)
+
+    def test_aucun_tmp_restant(self):
+        cache = Path(self.tmp.name) / "sous" / "x.css"
+        critical_css.write_cache(cache, "a{b:c}")
+        self.assertEqual(cache.read_text(encoding="utf-8"), "a{b:c}")
+        self.assertEqual([p.name for p in cache.parent.iterdir()], ["x.css"])
+
+
+if __name__ == "__main__":
+    unittest.main()
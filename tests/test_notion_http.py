@@ -0,0 +1,78 @@
+"""Seau à jetons de notion_http : pauses 429 avec une horloge factice."""
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "_scripts"))
+
+from notion_http import TokenBucket  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, secondes):
+        self.now += secondes
+
+
+def bucket(clock, rate=3, burst=3):
+    return TokenBucket(rate=rate, burst=burst, clock=clock, sleep=clock.sleep)
+
+
+class PauseTest(unittest.TestCase):
+    def test_pause_part_de_maintenant_malgre_un_stamp_ancien(self):
+        clock = FakeClock()
+        seau = bucket(clock)
+        seau.acquire()
+        clock.now += 10.0            # requête lente : stamp vieux de 10 s
+        seau.pause(1.0)              # Retry-After: 1
+        debut = clock.now
+        seau.acquire()
+        self.assertAlmostEqual(clock.now - debut, 1.0 + 1 / 3)
+
+    def test_pauses_concurrentes_ne_s_additionnent_pas(self):
+        clock = FakeClock()
+        seau = bucket(clock)
+        threads = [threading.Thread(target=seau.pause, args=(1.0,)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        seau.acquire()
+        self.assertAlmostEqual(clock.now, 1.0 + 1 / 3)
+
+    def test_la_pause_la_plus_longue_l_emporte(self):
+        clock = FakeClock()
+        seau = bucket(clock)
+        seau.pause(2.0)
+        seau.pause(0.5)
+        seau.acquire()
+        self.assertAlmostEqual(clock.now, 2.0 + 1 / 3)
+
+    def test_pauses_decalees_ne_s_additionnent_pas(self):
+        clock = FakeClock()
+        seau = bucket(clock)
+        seau.pause(3.0)              # jusqu'à t=3
+        clock.now = 2.0
+        seau.pause(1.0)              # jusqu'à t=3 aussi : dette inchangée
+        seau.acquire()
+        self.assertAlmostEqual(clock.now, 3.0 + 1 / 3)
+
+    def test_pause_decalee_plus_tardive_l_emporte(self):
+        clock = FakeClock()
+        seau = bucket(clock)
+        seau.pause(1.0)              # jusqu'à t=1
+        clock.now = 0.5
+        seau.pause(2.0)              # jusqu'à t=2.5
+        seau.acquire()
+        self.assertAlmostEqual(clock.now, 2.5 + 1 / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
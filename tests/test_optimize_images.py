@@ -0,0 +1,48 @@
+"""optimize-images.py : sources AVIF proposées dans les pages (<picture>, image-set())."""
+
+import importlib.util
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+spec = importlib.util.spec_from_file_location("optimize_images", ROOT / "optimize-images.py")
+optimize_images = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(optimize_images)
+
+AVIF = {"laura-douceur.webp": "laura-douceur.avif", "conference-hero.webp": "conference-hero.avif"}
+PAGE = """<style>
+    .hero-parallax {
+      background-image: url('/assets/img/conference-hero.webp');
+      background-size: cover;
+    }
+</style>
+<img src="/assets/img/laura-douceur.webp" alt="Laura">
+<img src="/assets/img/autre.webp" alt="">
+<picture><source type="image/webp" srcset="/a.webp"><img src="/assets/img/laura-douceur.webp"></picture>
+"""
+
+
+class AvifSourcesTest(unittest.TestCase):
+    def test_picture_et_image_set(self):
+        page = optimize_images.add_avif_sources(PAGE, AVIF)
+        self.assertIn(
+            '<picture><source type="image/avif" srcset="/assets/img/laura-douceur.avif">'
+            '<img src="/assets/img/laura-douceur.webp" alt="Laura"></picture>', page,
+        )
+        self.assertIn(
+            "      background-image: url('/assets/img/conference-hero.webp');\n"
+            "      background-image: image-set(url('/assets/img/conference-hero.avif') "
+            "type('image/avif'), url('/assets/img/conference-hero.webp') type('image/webp'));",
+            page,
+        )
+        self.assertIn('<img src="/assets/img/autre.webp" alt="">\n', page)
+        self.assertEqual(page.count("<picture>"), 2)
+
+    def test_idempotent_et_reversible(self):
+        page = optimize_images.add_avif_sources(PAGE, AVIF)
+        self.assertEqual(optimize_images.add_avif_sources(page, AVIF), page)
+        self.assertEqual(optimize_images.add_avif_sources(page, {}), PAGE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Recherche du blog : l'index (search_index + blog.js) trouve les mêmes articles que l'ancien parcours complet."""
+
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "_scripts"))
+
+from articles_listing import card  # noqa: E402
+from search_index import build_search_index  # noqa: E402
+
+QUERIES = [
+    "sensible", "hypersensible", "émotion", "emotions", "prise de parole",
+    "parole", "leader", "leadership", "confiance", "stress", "stress au travail",
+    "colère", "manager", "réunion", "conflit", "burn", "peur", "travail",
+    "les", "ia", "de", "xyz introuvable",
+]
+
+# searchArticles() de blog.js avant l'index : parcours de tous les articles
+ANCIEN = r"""
+function ancienSearch(articles, query) {
+  const queryNorm = normalize(query);
+  const queryWords = queryNorm.split(/\s+/).filter(w => w.length > 2);
+  return articles
+    .map(article => {
+      let score = 0;
+      if (normalize(article.title).includes(queryNorm)) score += 30;
+      queryWords.forEach(word => { if (normalize(article.title).includes(word)) score += 3; });
+      if (normalize(article.excerpt).includes(queryNorm)) score += 20;
+      queryWords.forEach(word => { if (normalize(article.excerpt).includes(word)) score += 2; });
+      article.tags.forEach(tag => {
+        if (normalize(tag).includes(queryNorm)) score += 20;
+        queryWords.forEach(word => { if (normalize(tag).includes(word)) score += 2; });
+      });
+      article.searchKeywords.forEach(keyword => {
+        if (normalize(keyword).includes(queryNorm)) score += 10;
+        if (queryNorm.includes(normalize(keyword))) score += 10;
+        queryWords.forEach(word => { if (normalize(keyword).includes(word)) score += 1; });
+      });
+      return { article, score };
+    })
+    .filter(item => item.score > 0)
+    .sort((a, b) => b.score - a.score)
+    .map(item => item.article);
+}
+"""
+
+HARNESS = r"""
+const fs = require('fs');
+const [blogJs, dataPath] = process.argv.slice(2);
+global.document = { addEventListener() {}, querySelector() { return null; }, querySelectorAll() { return []; } };
+global.window = { addEventListener() {} };
+eval(fs.readFileSync(blogJs, 'utf8') + ANCIEN + `
+const data = JSON.parse(fs.readFileSync(dataPath, 'utf8'));
+addArticles(data.cards);
+const out = {};
+data.queries.forEach(q => {
+  out[q] = {
+    ancien: ancienSearch(data.articles, q).map(a => a.slug),
+    index: searchArticles(data.index, q).map(a => a.slug),
+  };
+});
+console.log(JSON.stringify(out));
+`);
+"""
+
+
+@unittest.skipUnless(shutil.which("node"), "node absent")
+class ParityTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        articles = json.loads((ROOT / "blog" / "articles.json").read_text(encoding="utf-8"))["articles"]
+        data = {
+            "articles": articles,
+            "cards": [card(article) for article in articles],
+            "index": build_search_index(articles),
+            "queries": QUERIES,
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            data_path = Path(tmp) / "data.json"
+            data_path.write_text(json.dumps(data), encoding="utf-8")
+            script = Path(tmp) / "harness.js"
+            script.write_text(HARNESS.replace("ANCIEN", json.dumps(ANCIEN)), encoding="utf-8")
+            sortie = subprocess.run(
+                ["node", str(script), str(ROOT / "assets" / "js" / "blog.js"), str(data_path)],
+                capture_output=True, text=True, check=True,
+            )
+        cls.results = json.loads(sortie.stdout)
+
+    def test_memes_articles_que_l_ancien_parcours(self):
+        for query, r in self.results.items():
+            with self.subTest(query=query):
+                self.assertEqual(set(r["index"]), set(r["ancien"]))
+
+    def test_mot_contenu_dans_un_token(self):
+        self.assertTrue(self.results["sensible"]["index"])
+
+    def test_meme_premier_resultat(self):
+        for query, r in self.results.items():
+            with self.subTest(query=query):
+                self.assertEqual(r["index"][:1], r["ancien"][:1])
+
+
+if __name__ == "__main__":
+    unittest.main()